@@ -0,0 +1,152 @@
+import numpy as np
+import pandas as pd
+
+from cost_engine import DURATION_QUESTION, RESULT_COLUMNS, THROUGHPUT_QUESTION
+
+LOGIC_FIELDS = ("ecs_tasks", "ecs_vcpu", "ecs_memory", "connector_tasks", "eks_nodes", "data_transfer_multiplier")
+
+
+class LogicTables:
+    __slots__ = ("question_ids", "answer_ids", "values")
+
+    def __init__(self, model):
+        by_question = {}
+        for (q_id, answer_id), record in model.logic_index.items():
+            by_question.setdefault(q_id, []).append((answer_id, record))
+
+        # Questions are folded in questionnaire order, the order the GUI stores responses in
+        ordered = [q_id for q_id in model.question_ids if q_id in by_question]
+        ordered += sorted(q_id for q_id in by_question if q_id not in ordered)
+
+        self.question_ids = tuple(ordered)
+        self.answer_ids = []
+        self.values = []
+        for q_id in self.question_ids:
+            rows = sorted(by_question[q_id], key=lambda item: item[0])
+            self.answer_ids.append(np.array([answer_id for answer_id, _ in rows], dtype=np.float64))
+            self.values.append({field: np.array([getattr(record, field) for _, record in rows])
+                                for field in LOGIC_FIELDS})
+
+
+def scenario_column(scenarios, q_id):
+    for key in (q_id, str(q_id)):
+        if key in scenarios:
+            return pd.to_numeric(scenarios[key], errors="coerce").to_numpy(dtype=np.float64)
+    return None
+
+
+def fold_logic(size, matches):
+    # matches yields (matched mask, logic value arrays, row of each scenario in those arrays) per question
+    ecs_tasks = np.zeros(size, dtype=np.int64)
+    ecs_vcpu = np.zeros(size, dtype=np.int64)
+    ecs_memory = np.zeros(size, dtype=np.int64)
+    connector_tasks = np.ones(size, dtype=np.int64)
+    data_transfer_multiplier = np.ones(size)
+    last_eks_nodes = np.zeros(size, dtype=np.int64)
+    matched_any = np.zeros(size, dtype=bool)
+
+    for matched, values, rows in matches:
+        ecs_tasks = np.maximum(ecs_tasks, np.where(matched, values["ecs_tasks"][rows], 0))
+        ecs_vcpu = np.maximum(ecs_vcpu, np.where(matched, values["ecs_vcpu"][rows], 0))
+        ecs_memory = np.maximum(ecs_memory, np.where(matched, values["ecs_memory"][rows], 0))
+        connector_tasks = np.maximum(connector_tasks, np.where(matched, values["connector_tasks"][rows], 0))
+        data_transfer_multiplier = data_transfer_multiplier * np.where(
+            matched, values["data_transfer_multiplier"][rows], 1.0)
+        last_eks_nodes = np.where(matched, values["eks_nodes"][rows], last_eks_nodes)
+        matched_any |= matched
+
+    # Mirrors the scalar loop: EKS nodes come from the last matched answer, floored by ECS tasks
+    eks_nodes = np.where(matched_any, np.maximum(ecs_tasks, last_eks_nodes), 0)
+    return ecs_tasks, ecs_vcpu, ecs_memory, connector_tasks, eks_nodes, data_transfer_multiplier
+
+
+def quote_arrays(tables, answers, throughput, duration, pricing):
+    def matches():
+        for answer_ids, values, chosen in zip(tables.answer_ids, tables.values, answers):
+            if chosen is None:
+                continue
+            pos = np.searchsorted(answer_ids, chosen)
+            np.minimum(pos, len(answer_ids) - 1, out=pos)
+            yield answer_ids[pos] == chosen, values, pos  # NaN never matches
+
+    return price_arrays(*fold_logic(len(throughput), matches()), throughput, duration, pricing)
+
+
+def quote_codes(questionnaire, codes, numbers):
+    # codes/numbers are stacked questionnaire.encode vectors (one row per scenario); the dense answer codes
+    # index the flat Logic arrays directly, so no per-question search is needed
+    codes = np.asarray(codes, dtype=np.int64).reshape(-1, len(questionnaire.choice_questions))
+    numbers = np.asarray(numbers, dtype=np.float64).reshape(len(codes), len(questionnaire.numeric_questions))
+    logic = {field: np.frombuffer(values, dtype=values.typecode) for field, values in questionnaire.logic.items()}
+    has_logic = np.frombuffer(questionnaire.has_logic, dtype=np.int8).astype(bool)
+
+    def matches():
+        for position, offset in enumerate(questionnaire.offsets):
+            code = codes[:, position]
+            rows = offset + np.maximum(code - 1, 0)
+            if len(has_logic):
+                np.minimum(rows, len(has_logic) - 1, out=rows)
+                yield (code > 0) & has_logic[rows], logic, rows
+
+    def numeric(q_id):
+        if q_id not in questionnaire.numeric_questions:
+            return np.zeros(len(codes))
+        return np.nan_to_num(numbers[:, questionnaire.numeric_questions.index(q_id)], nan=0.0)
+
+    return price_arrays(*fold_logic(len(codes), matches()), numeric(THROUGHPUT_QUESTION),
+                        numeric(DURATION_QUESTION), questionnaire.pricing)
+
+
+def price_arrays(ecs_tasks, ecs_vcpu, ecs_memory, connector_tasks, eks_nodes, data_transfer_multiplier,
+                 throughput, duration, pricing):
+    data_transfer_gb = ((throughput * 3600) / 1024) * duration * data_transfer_multiplier
+
+    ecs_vcpu_cost = ecs_tasks * ecs_vcpu * duration * pricing['ECS vCPU Cost per hour']
+    ecs_memory_cost = ecs_tasks * ecs_memory * duration * pricing['ECS Memory Cost per GB-hour']
+    ecs_data_transfer_cost = data_transfer_gb * pricing['ECS Data Transfer Cost per GB']
+
+    connector_task_cost = duration * pricing['Confluent Cost per task/hour'] * connector_tasks
+    connector_data_transfer_cost = data_transfer_gb * pricing['Confluent Data Transfer Cost per GB']
+
+    eks_cluster_cost = duration * pricing['EKS Cluster Cost per hour']
+    eks_node_cost = eks_nodes * duration * pricing['EC2 Instance Cost per hour']
+    eks_data_transfer_cost = data_transfer_gb * pricing['EC2 Data Transfer Cost per GB']
+
+    return {
+        'throughput': throughput,
+        'duration': duration,
+        'data_transfer_gb': data_transfer_gb,
+        'ecs_tasks': ecs_tasks,
+        'ecs_vcpu': ecs_vcpu,
+        'ecs_memory': ecs_memory,
+        'ecs_vcpu_cost': ecs_vcpu_cost,
+        'ecs_memory_cost': ecs_memory_cost,
+        'ecs_data_transfer_cost': ecs_data_transfer_cost,
+        'ecs_total': ecs_vcpu_cost + ecs_memory_cost + ecs_data_transfer_cost,
+        'confluent_tasks': connector_tasks,
+        'confluent_task_cost': connector_task_cost,
+        'confluent_data_transfer_cost': connector_data_transfer_cost,
+        'confluent_total': connector_task_cost + connector_data_transfer_cost,
+        'eks_nodes': eks_nodes,
+        'eks_cluster_cost': eks_cluster_cost,
+        'eks_node_cost': eks_node_cost,
+        'eks_data_transfer_cost': eks_data_transfer_cost,
+        'eks_total': eks_cluster_cost + eks_node_cost + eks_data_transfer_cost,
+    }
+
+
+def quote_batch(scenarios, model, tables=None):
+    if tables is None:
+        tables = LogicTables(model)
+    size = len(scenarios)
+
+    def numeric(q_id):
+        column = scenario_column(scenarios, q_id)
+        if column is None:
+            return np.zeros(size)
+        return np.nan_to_num(column, nan=0.0)
+
+    answers = [scenario_column(scenarios, q_id) for q_id in tables.question_ids]
+    arrays = quote_arrays(tables, answers, numeric(THROUGHPUT_QUESTION), numeric(DURATION_QUESTION),
+                          model.pricing)
+    return pd.DataFrame({column: arrays[column] for column in RESULT_COLUMNS}, index=scenarios.index)
@@ -0,0 +1,46 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What the GUI paid before the home screen appeared, versus what it pays now
+SCENARIOS = {
+    "eager (pre-lazy startup)": (
+        "import tkinter, pandas, PIL.Image, PIL.ImageTk, matplotlib.pyplot, "
+        "matplotlib.backends.backend_tkagg, reportlab.platypus\n"
+        "import cost_calculator, results, export_report\n"
+        "from workbook import load_workbook; load_workbook()"
+    ),
+    "lazy (current startup)": (
+        "import cost_calculator\n"
+        "from workbook import build_cost_model, load_tables; build_cost_model(load_tables())"
+    ),
+    "deferred (results + export)": "import results, export_report",
+}
+
+TIMER = "import time; _t = time.perf_counter()\n{code}\nprint(time.perf_counter() - _t)"
+
+
+def time_snippet(code, repeat):
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", TIMER.format(code=code)], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        samples.append(float(output.strip().splitlines()[-1]) * 1000)
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure GUI startup import cost in fresh interpreters.")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for name, code in SCENARIOS.items():
+        print(f"{name:<30} {time_snippet(code, args.repeat):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def random_scenario(rng):
+    return {"1": rng.choice([1, 2]), "2": rng.randint(1, 1000), "3": rng.choice([1, 2]), "4": rng.randint(1, 744)}
+
+
+async def post(reader, writer, host, body):
+    writer.write((f"POST /quote HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode() + body)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def client(host, port, requests, batch_size, distinct, latencies, errors, seed):
+    rng = random.Random(seed)
+    pool = [random_scenario(rng) for _ in range(distinct)]
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(requests):
+            if batch_size == 1:
+                body = json.dumps(rng.choice(pool)).encode()
+            else:
+                body = json.dumps([rng.choice(pool) for _ in range(batch_size)]).encode()
+            start = time.perf_counter()
+            status = await post(reader, writer, host, body)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run(args):
+    latencies, errors = [], []
+    per_client = args.requests // args.concurrency
+    start = time.perf_counter()
+    await asyncio.gather(*(client(args.host, args.port, per_client, args.batch_size, args.distinct,
+                                  latencies, errors, seed) for seed in range(args.concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"requests:     {len(latencies)} ({len(errors)} errors)")
+    print(f"scenarios:    {len(latencies) * args.batch_size}")
+    print(f"elapsed:      {elapsed:.2f} s")
+    print(f"throughput:   {len(latencies) / elapsed:.0f} req/s, {len(latencies) * args.batch_size / elapsed:.0f} quotes/s")
+    print(f"latency p50:  {statistics.median(latencies) * 1000:.2f} ms")
+    print(f"latency p99:  {latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f} ms")
+
+
+async def wait_for_port(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the quote service on localhost.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=1, help="scenarios per POST body")
+    parser.add_argument("--distinct", type=int, default=500, help="distinct scenarios each client draws from")
+    parser.add_argument("--spawn", action="store_true", help="start quote_service.py for the duration of the run")
+    parser.add_argument("--workers", type=int, default=1, help="--workers passed to a spawned service")
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.spawn:
+        server = subprocess.Popen([sys.executable, "quote_service.py", "--host", args.host, "--port", str(args.port),
+                                   "--workers", str(args.workers)], cwd=REPO_ROOT)
+    try:
+        asyncio.run(wait_for_port(args.host, args.port))
+        asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import argparse
+import gc
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tkinter as tk
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+from cost_calculator import CostCalculatorApp  # noqa: E402
+
+
+def answer_quiz(app, rng):
+    app.start_quiz()
+    for index, (q_id, _, input_type) in enumerate(app.questions):
+        if input_type == 'Multiple Choice':
+            app.question_view.var.set(rng.choice(app.answer_index[q_id])[0])
+        else:
+            app.question_view.var.set(str(rng.randint(1, 1000)))
+        if index < len(app.questions) - 1:
+            app.next_question()
+    app.show_results()
+    # Results are computed on the background worker; pump Tk until they have been displayed
+    while app.worker.pending:
+        app.root.update()
+        time.sleep(0.001)
+    app.root.update()
+
+
+def start_virtual_display():
+    # Lets the check run on a headless machine that has Xvfb installed
+    if os.environ.get("DISPLAY") or shutil.which("Xvfb") is None:
+        return None
+    display = f":{90 + os.getpid() % 100}"
+    server = subprocess.Popen(["Xvfb", display, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    socket_path = f"/tmp/.X11-unix/X{display[1:]}"
+    for _ in range(100):
+        if os.path.exists(socket_path) or server.poll() is not None:
+            break
+        time.sleep(0.05)
+    os.environ["DISPLAY"] = display
+    return server
+
+
+def clear_text_metrics_cache(app):
+    # matplotlib caches text extents per renderer in an LRU bounded at 4096 entries. Every new "$123.45" bar
+    # label adds one, so until that cache is full it looks like ~2 KB of growth per recalculation.
+    # Clearing it before sampling keeps the check about memory the app itself holds on to.
+    import matplotlib.text
+
+    view = app.resutls_view
+    metrics = getattr(matplotlib.text, "_get_text_metrics_function", None)
+    if view is None or metrics is None:
+        return
+    metrics(view.chart.get_renderer()).cache_clear()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that repeated recalculation keeps memory flat.")
+    parser.add_argument("--cycles", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--sample-every", type=int, default=50)
+    parser.add_argument("--max-growth-kb", type=float, default=512.0)
+    args = parser.parse_args(argv)
+
+    server = start_virtual_display()
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"needs a display (set DISPLAY or install Xvfb): {e}")
+        return 2
+    root.withdraw()
+    app = CostCalculatorApp(root)
+    rng = random.Random(0)
+
+    for _ in range(args.warmup):
+        answer_quiz(app, rng)
+
+    clear_text_metrics_cache(app)
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    print(f"{'cycle':>6} {'traced KB':>10} {'toplevels':>10} {'gc objects':>11}")
+    for cycle in range(1, args.cycles + 1):
+        answer_quiz(app, rng)
+        if cycle % args.sample_every == 0 or cycle == args.cycles:
+            clear_text_metrics_cache(app)
+            gc.collect()
+            current = tracemalloc.get_traced_memory()[0]
+            toplevels = sum(isinstance(widget, tk.Toplevel) for widget in root.winfo_children())
+            print(f"{cycle:>6} {(current - baseline) / 1024:>10.1f} {toplevels:>10} {len(gc.get_objects()):>11}")
+
+    growth_kb = (tracemalloc.get_traced_memory()[0] - baseline) / 1024
+    root.destroy()
+    if server is not None:
+        server.terminate()
+    print(f"growth after {args.cycles} recalculations: {growth_kb:.1f} KB")
+    return 0 if growth_kb <= args.max_growth_kb else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
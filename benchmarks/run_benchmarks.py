@@ -0,0 +1,268 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+os.chdir(REPO_ROOT)
+
+from cost_engine import calculate_costs  # noqa: E402
+from questionnaire import CompiledQuestionnaire  # noqa: E402
+from workbook import (WORKBOOK_PATH, build_answer_index, build_cost_model, build_question_list,  # noqa: E402
+                      load_snapshot, load_tables)
+
+LOGIC_SIZES = (10, 1_000, 10_000, 100_000)
+CHOICE_QUESTIONS = 10
+
+
+def measure(fn, repeat, number=1, warmup=1):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number * 1000)
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "max_ms": max(samples),
+            "repeat": repeat, "number": number}
+
+
+def synthetic_tables(logic_rows, seed=0):
+    # A fixed number of questions with a growing number of answers each, so only the Logic sheet grows
+    rng = random.Random(seed)
+    answers_per_question = max(1, logic_rows // CHOICE_QUESTIONS)
+    choice_ids = [q_id for q_id in range(1, CHOICE_QUESTIONS + 3) if q_id not in (2, 4)][:CHOICE_QUESTIONS]
+    question_ids = sorted(choice_ids + [2, 4])
+    logic = {column: [] for column in ('Question ID', 'Answer ID', 'ECS Tasks', 'ECS vCPU', 'ECS Memory (GB)',
+                                       'Connector Tasks', 'EKS Nodes', 'Data Transfer Multiplier')}
+    for q_id in choice_ids:
+        for answer_id in range(1, answers_per_question + 1):
+            logic['Question ID'].append(q_id)
+            logic['Answer ID'].append(answer_id)
+            logic['ECS Tasks'].append(rng.randint(1, 8))
+            logic['ECS vCPU'].append(rng.randint(1, 4))
+            logic['ECS Memory (GB)'].append(rng.randint(1, 16))
+            logic['Connector Tasks'].append(rng.randint(1, 8))
+            logic['EKS Nodes'].append(rng.randint(1, 8))
+            logic['Data Transfer Multiplier'].append(rng.choice([1.0, 1.1, 1.2, 1.5]))
+
+    tables = load_tables(WORKBOOK_PATH)
+    tables = dict(tables, Logic=logic, Questions={
+        'Question ID': question_ids,
+        'Question Text': [f"Question {q_id}" for q_id in question_ids],
+        'Input Type': ['Numeric' if q_id in (2, 4) else 'Multiple Choice' for q_id in question_ids],
+    })
+    responses = {q_id: (float(rng.randint(1, 1000)) if q_id in (2, 4) else rng.randint(1, answers_per_question))
+                 for q_id in question_ids}
+    return tables, responses
+
+
+def bench_load(results, repeat):
+    results["load/parse_workbook"] = measure(lambda: load_tables(WORKBOOK_PATH, use_cache=False), max(3, repeat // 5))
+    results["load/cached_tables"] = measure(lambda: load_tables(WORKBOOK_PATH), repeat, number=10)
+    results["load/snapshot"] = measure(lambda: load_snapshot(WORKBOOK_PATH), repeat, number=10)
+
+
+def bench_calculate(results, repeat):
+    import numpy as np
+    import pandas as pd
+
+    from batch import quote_batch, quote_codes
+
+    for size in LOGIC_SIZES:
+        tables, responses = synthetic_tables(size)
+        model = build_cost_model(tables)
+        results[f"calculate/scalar/logic_{size}"] = measure(lambda: calculate_costs(responses, model), repeat,
+                                                            number=1000)
+
+        scenarios = pd.DataFrame([responses] * 10_000)
+        results[f"calculate/batch_10k/logic_{size}"] = measure(lambda: quote_batch(scenarios, model),
+                                                               max(3, repeat // 2))
+
+        questionnaire = CompiledQuestionnaire(build_question_list(tables["Questions"]),
+                                              build_answer_index(tables["Answers"]), model)
+        codes, numbers = questionnaire.encode(responses)
+        results[f"calculate/compiled/logic_{size}"] = measure(lambda: questionnaire.costs(codes, numbers), repeat,
+                                                              number=1000)
+        codes, numbers = np.tile(codes, (10_000, 1)), np.tile(numbers, (10_000, 1))
+        results[f"calculate/codes_10k/logic_{size}"] = measure(lambda: quote_codes(questionnaire, codes, numbers),
+                                                               max(3, repeat // 2))
+
+
+def bench_export(results, repeat):
+    from export_report import build_pdf
+
+    model = load_snapshot(WORKBOOK_PATH).model
+    costs = calculate_costs({1: 1, 2: 10.0, 3: 2, 4: 720.0}, model)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "report.pdf")
+        results["export/build_pdf"] = measure(lambda: build_pdf(costs, path), repeat)
+
+
+def bench_sessions(results, repeat):
+    from sessions import SessionStore, reprice_sessions
+
+    snapshot = load_snapshot(WORKBOOK_PATH)
+    questionnaire = snapshot.questionnaire
+    rng = random.Random(0)
+    sessions = []
+    for index in range(1_000):
+        # Every other session is a quiz saved part-way, with the 0 the GUI keeps for a skipped choice question
+        partial = index % 2 == 1
+        responses = {}
+        for q_id, _, input_type in snapshot.questions:
+            if input_type == 'Numeric':
+                responses[q_id] = float(rng.randint(1, 1000))
+            elif partial and rng.random() < 0.5:
+                responses[q_id] = 0
+            else:
+                responses[q_id] = rng.choice(snapshot.answer_index[q_id])[0]
+        sessions.append((f"session {index}", responses))
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "sessions.idms")
+
+        def save_all():
+            if os.path.exists(path):
+                os.unlink(path)
+            store = SessionStore(path)
+            for name, responses in sessions:
+                store.save(name, responses, questionnaire)
+
+        results["sessions/save_1k"] = measure(save_all, max(3, repeat // 2))
+        results["sessions/open_1k"] = measure(lambda: SessionStore(path), repeat, number=10)
+
+        store = SessionStore(path)
+        for name, responses in sessions:
+            restored = store.responses(store.read(name), questionnaire)
+            expected = {q_id: answer for q_id, answer in responses.items() if answer != 0}
+            assert restored == expected, f"{name} restored as {restored}, saved {responses}"
+            assert store.read(name).totals['EKS'] == calculate_costs(responses, snapshot.model)['EKS']['total']
+        results["sessions/reprice_1k"] = measure(lambda: reprice_sessions(SessionStore(path), questionnaire),
+                                                 max(3, repeat // 2))
+
+
+def bench_gui(results, repeat):
+    import tkinter as tk
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        results["gui"] = {"skipped": f"no display: {e}"}
+        return
+    root.withdraw()
+
+    from cost_calculator import CostCalculatorApp
+    from results import Results
+
+    app = CostCalculatorApp(root)
+    app.start_quiz()
+    last = len(app.questions) - 1
+
+    def navigate():
+        while app.current_question < last:
+            app.next_question()
+            root.update_idletasks()
+        while app.current_question > 0:
+            app.prev_question()
+            root.update_idletasks()
+
+    for index, (q_id, _, input_type) in enumerate(app.questions):
+        app.current_question = index
+        app.show_question()
+        app.question_view.var.set(app.answer_index[q_id][0][0] if input_type == 'Multiple Choice' else "10")
+        app.save_response()
+    app.current_question = 0
+    app.show_question()
+
+    steps = 2 * last
+    timing = measure(navigate, repeat)
+    results["gui/show_question_step"] = {key: value / steps if key.endswith("_ms") else value
+                                         for key, value in timing.items()}
+
+    costs = app.calculate_costs()
+
+    def construct():
+        view = Results(app.main_frame, app, costs)
+        root.update_idletasks()
+        view.results_window.destroy()
+        view.destroy()
+
+    results["gui/results_construct"] = measure(construct, max(3, repeat // 2))
+
+    view = Results(app.main_frame, app, costs)
+    results["gui/results_update"] = measure(lambda: (view.load_result_view(costs), root.update_idletasks()), repeat)
+    view.results_window.destroy()
+    app.worker.shutdown()
+    root.destroy()
+
+
+SUITES = {"load": bench_load, "calculate": bench_calculate, "export": bench_export, "sessions": bench_sessions,
+          "gui": bench_gui}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current, baseline_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    print(f"\n{'benchmark':<40} {'baseline ms':>12} {'current ms':>12} {'ratio':>8}")
+    for name, result in current.items():
+        old = baseline.get(name)
+        if "median_ms" not in result or not old or "median_ms" not in old:
+            continue
+        ratio = result["median_ms"] / old["median_ms"] if old["median_ms"] else float("inf")
+        print(f"{name:<40} {old['median_ms']:>12.4f} {result['median_ms']:>12.4f} {ratio:>7.2f}x")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark load, calculation, GUI and export hot paths.")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES), help="run only these suites")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="JSON from a previous run to compare against")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name in args.suite or SUITES:
+        SUITES[name](results, args.repeat)
+
+    for name, result in results.items():
+        if "median_ms" in result:
+            print(f"{name:<40} median {result['median_ms']:10.4f} ms   min {result['min_ms']:10.4f} ms")
+        else:
+            print(f"{name:<40} {result}")
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import argparse
+import csv
+import json
+import math
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from cost_engine import RESULT_COLUMNS, calculate_costs, flatten_costs
+from quote_cache import normalize_responses
+from workbook import WORKBOOK_PATH, build_cost_model, load_tables
+
+_worker_model = None
+
+
+def detect_format(path, default="csv"):
+    if path.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    if path.endswith(".csv"):
+        return "csv"
+    return default
+
+
+def read_rows(stream, fmt):
+    if fmt == "jsonl":
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+    else:
+        yield from csv.DictReader(stream)
+
+
+def chunked(rows, size):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def choice_answer(value):
+    # Answer IDs are whole numbers: "2" and 2.0 are answer 2, but 1.7 is an error rather than answer 1
+    if isinstance(value, bool):
+        raise ValueError(f"answer {value!r} is not a whole number")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    number = float(value)
+    if not number.is_integer():
+        raise ValueError(f"answer {value!r} is not a whole number")
+    return int(number)
+
+
+def numeric_answer(value):
+    if isinstance(value, bool):
+        raise ValueError(f"answer {value!r} is not a number")
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f"answer {value!r} is not a finite number")
+    return number
+
+
+def row_responses(row, choice_questions, question_ids=()):
+    responses = {}
+    for key, value in row.items():
+        key = str(key)
+        if not key.isdigit() or value is None or value == "":
+            continue
+        q_id = int(key)
+        # Multiple choice answers stay ints, numeric answers become floats, like save_response
+        responses[q_id] = choice_answer(value) if q_id in choice_questions else numeric_answer(value)
+    # Questionnaire order rather than column/key order, so EKS nodes come from the same "last" answer
+    # whichever path (GUI, cache, batch, CLI) prices the scenario
+    return dict(normalize_responses(responses, question_ids))
+
+
+def price_rows(rows, model):
+    choice_questions = {q_id for q_id, _ in model.logic_index}
+    results = []
+    for row in rows:
+        passthrough = {key: value for key, value in row.items() if not str(key).isdigit()}
+        try:
+            costs = calculate_costs(row_responses(row, choice_questions, model.question_ids), model)
+        except (TypeError, ValueError, OverflowError) as e:
+            passthrough["error"] = str(e)
+            results.append(passthrough)
+            continue
+        passthrough.update(flatten_costs(costs))
+        results.append(passthrough)
+    return results
+
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = model
+
+
+def _price_chunk(rows):
+    return price_rows(rows, _worker_model)
+
+
+def price_stream(rows, model, workers=1, chunk_size=500):
+    if workers <= 1:
+        for chunk in chunked(rows, chunk_size):
+            yield from price_rows(chunk, model)
+        return
+
+    # Keep a bounded window of chunks in flight so huge inputs never load into memory at once
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(model,)) as pool:
+        pending = deque()
+        for chunk in chunked(rows, chunk_size):
+            pending.append(pool.submit(_price_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def write_rows(results, stream, fmt):
+    if fmt == "jsonl":
+        for result in results:
+            stream.write(json.dumps(result) + "\n")
+        return
+
+    writer = None
+    for result in results:
+        if writer is None:
+            extra = [key for key in result if key not in RESULT_COLUMNS and key != "error"]
+            writer = csv.DictWriter(stream, fieldnames=extra + list(RESULT_COLUMNS) + ["error"],
+                                    extrasaction="ignore")
+            writer.writeheader()
+        writer.writerow(result)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Price cloud cost scenarios from CSV or JSONL.")
+    parser.add_argument("input", nargs="?", default="-", help="scenario file, or - for stdin (default)")
+    parser.add_argument("-o", "--output", default="-", help="result file, or - for stdout (default)")
+    parser.add_argument("--input-format", choices=("csv", "jsonl"), help="defaults to the input file extension")
+    parser.add_argument("--output-format", choices=("csv", "jsonl"), help="defaults to the input format")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes (default 1)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="rows handed to a worker at a time")
+    parser.add_argument("--workbook", default=WORKBOOK_PATH, help="pricing workbook to load")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    input_format = args.input_format or detect_format(args.input)
+    output_format = args.output_format or detect_format(args.output, input_format)
+
+    model = build_cost_model(load_tables(args.workbook))
+
+    source = sys.stdin if args.input == "-" else open(args.input, newline="", encoding="utf-8")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        results = price_stream(read_rows(source, input_format), model, args.workers, args.chunk_size)
+        write_rows(results, target, output_format)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,25 @@
+import importlib
+import os
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
-import pandas as pd
-from PIL import Image, ImageTk
+from tkinter import ttk, filedialog, messagebox, simpledialog
 
-from results import Results
+from cost_engine import IncrementalQuote
+from hot_reload import POLL_INTERVAL_MS, WorkbookWatcher
+from instrumentation import INSTRUMENTATION, timed
+from question_view import QuestionView
+from worker import BackgroundWorker
+from quote_cache import DEFAULT_CACHE_SIZE, QuoteCache
+from sessions import SESSIONS_PATH, SessionStore, reprice_sessions
+from workbook import WORKBOOK_PATH, load_snapshot
+
+QUOTE_CACHE_SIZE = int(os.environ.get("IDM_QUOTE_CACHE_SIZE", DEFAULT_CACHE_SIZE))
+PREVIEW_DELAY_MS = 300
+START_IMAGE_PATH = "assets/image.png"
+START_IMAGE_SIZE = (50, 50)
+
+# Only needed once results are shown; imported in the background while the user answers questions
+DEFERRED_MODULES = ("results", "export_report")
 
 class CostCalculatorApp:
     def __init__(self, root):
@@ -12,21 +28,28 @@ class CostCalculatorApp:
         self.root.geometry("1000x700")
 
         # Initialize data and UI states
-        self.questions = None
-        self.answers = None
-        self.logic = None
-        self.pricing = None
+        self.snapshot = None
+        self.pending_snapshot = None
+        self.questions = ()
+        self.model = None
+        self.answer_index = {}
+        self.questionnaire = None
+        self.sessions = None
+        self.quote_cache = QuoteCache(QUOTE_CACHE_SIZE)
         self.user_responses = {}
         self.current_question = 0
+        self.question_view = None
+        self.resutls_view = None
+        self.live_quote = None
+        self.preview_job = None
+        self.worker = BackgroundWorker(self.root)
+        self.calculation_task = None
 
         # Configure styles
         self.setup_styles()
         self.load_data()
 
-        # Load and resize the image
-        img = Image.open("assets/image.png")  # Replace with your image path
-        img = img.resize((50, 50), Image.LANCZOS)  # Adjust size as needed
-        self.start_img = ImageTk.PhotoImage(img)
+        self.start_img = self.load_start_image()
 
         self.create_menu()  # Add menu bar
 
@@ -35,6 +58,37 @@ class CostCalculatorApp:
         self.main_frame.pack(fill=tk.BOTH, expand=True)
         self.show_home()
 
+        if self.snapshot is not None:
+            self.watcher = WorkbookWatcher(WORKBOOK_PATH, self.snapshot.stamp)
+            self.root.after(POLL_INTERVAL_MS, self.check_workbook)
+
+        threading.Thread(target=self.preload_modules, daemon=True).start()
+
+    def preload_modules(self):
+        for name in DEFERRED_MODULES:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                # Surfaced again, with a proper traceback, when the module is really needed
+                pass
+
+    def load_start_image(self):
+        # The resized icon is cached next to the original so PIL is only needed the first time
+        folder, name = os.path.split(START_IMAGE_PATH)
+        thumb_path = os.path.join(folder, f".{name}.{START_IMAGE_SIZE[0]}x{START_IMAGE_SIZE[1]}.png")
+        if os.path.exists(thumb_path) and os.path.getmtime(thumb_path) >= os.path.getmtime(START_IMAGE_PATH):
+            return tk.PhotoImage(file=thumb_path)
+
+        from PIL import Image, ImageTk
+
+        img = Image.open(START_IMAGE_PATH)
+        img = img.resize(START_IMAGE_SIZE, Image.LANCZOS)
+        try:
+            img.save(thumb_path)
+        except OSError:
+            pass
+        return ImageTk.PhotoImage(img)
+
     def setup_styles(self):
         self.style = ttk.Style()
         self.style.configure("TLabel", font=("Arial", 12), padding=10)
@@ -43,16 +97,48 @@ class CostCalculatorApp:
         # self.style.configure("Accent.TButton", foreground="#ffffff", background="#2c3e50")
         # self.style.configure("Accent.TButton", font=("Arial", 12, "bold"), foreground="black", padding=(10, 5), background="#4CAF50")
 
+    @timed("load_data")
     def load_data(self):
         try:
-            self.questions = pd.read_excel("assets/cloud_costs.xlsx", sheet_name="Questions")
-            self.answers = pd.read_excel("assets/cloud_costs.xlsx", sheet_name="Answers")
-            self.logic = pd.read_excel("assets/cloud_costs.xlsx", sheet_name="Logic")
-            self.pricing = pd.read_excel("assets/cloud_costs.xlsx", sheet_name="Pricing").set_index('Parameter')['Value (USD)']
+            self.apply_snapshot(load_snapshot(WORKBOOK_PATH))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to load data: {str(e)}")
             self.root.destroy()
 
+    def apply_snapshot(self, snapshot):
+        # Calculations already running keep the model they were started with; new ones see this one
+        self.snapshot = snapshot
+        self.model = snapshot.model
+        quiz_in_progress = self.question_view is not None and self.question_view.winfo_manager()
+        if quiz_in_progress and snapshot.questions != self.questions:
+            # Don't change the questionnaire under the user; it is swapped in when the next quiz starts
+            self.pending_snapshot = snapshot
+        else:
+            self.pending_snapshot = None
+            self.questions = snapshot.questions
+            self.answer_index = snapshot.answer_index
+            self.questionnaire = snapshot.questionnaire
+
+        if self.live_quote is not None:
+            self.live_quote = IncrementalQuote(self.model)
+            for q_id, answer in self.user_responses.items():
+                self.live_quote.set_response(q_id, answer)
+            self.update_preview()
+
+    def check_workbook(self):
+        if self.watcher.poll():
+            self.worker.submit(lambda task: self.watcher.load(),
+                               on_done=self.workbook_reloaded, on_error=self.workbook_reload_failed)
+        self.root.after(POLL_INTERVAL_MS, self.check_workbook)
+
+    def workbook_reloaded(self, snapshot):
+        self.watcher.accept(snapshot)
+        self.apply_snapshot(snapshot)
+
+    def workbook_reload_failed(self, error):
+        self.watcher.reject()
+        messagebox.showwarning("Pricing Reload Failed", f"Keeping the current pricing.\n{str(error)}")
+
     def create_menu(self):
         menu_bar = tk.Menu(self.root)
         self.root.config(menu=menu_bar)
@@ -61,23 +147,104 @@ class CostCalculatorApp:
         file_menu = tk.Menu(menu_bar, tearoff=0)
         file_menu.add_command(label="Home", command=self.open_file)
         file_menu.add_separator()
+        file_menu.add_command(label="Save Session...", command=self.save_session)
+        file_menu.add_command(label="Open Session...", command=self.show_sessions)
+        file_menu.add_command(label="Re-price Saved Sessions...", command=self.reprice_sessions)
+        file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.root.quit)
         menu_bar.add_cascade(label="File", menu=file_menu)
 
         # Help Menu
         help_menu = tk.Menu(menu_bar, tearoff=0)
         help_menu.add_command(label="About", command=self.show_about)
+        help_menu.add_separator()
+        self.instrumentation_var = tk.BooleanVar(value=INSTRUMENTATION.enabled)
+        help_menu.add_checkbutton(label="Enable Instrumentation", variable=self.instrumentation_var,
+                                  command=self.toggle_instrumentation)
+        help_menu.add_command(label="Diagnostics...", command=self.show_diagnostics)
         menu_bar.add_cascade(label="Help", menu=help_menu)
 
     def open_file(self):
         self.show_home()
 
+    def session_store(self):
+        if self.sessions is None:
+            try:
+                self.sessions = SessionStore(SESSIONS_PATH)
+            except (OSError, ValueError) as e:
+                messagebox.showerror("Sessions", f"Cannot open saved sessions: {str(e)}")
+        return self.sessions
+
+    def save_session(self):
+        if self.question_view is not None and self.question_view.winfo_manager() and not self.save_response():
+            return
+        if not self.user_responses:
+            messagebox.showinfo("Save Session", "Answer some questions before saving a session.")
+            return
+        store = self.session_store()
+        if store is None:
+            return
+        name = simpledialog.askstring("Save Session", "Session name:", parent=self.root)
+        if not name:
+            return
+        if name in store and not messagebox.askyesno("Save Session", f"Replace the saved session '{name}'?"):
+            return
+        try:
+            store.save(name, self.user_responses, self.questionnaire)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Save Session", f"Failed to save session: {str(e)}")
+
+    def show_sessions(self):
+        from session_browser import SessionBrowser
+
+        if self.session_store() is not None:
+            SessionBrowser(self.root, self)
+
+    def open_session(self, name):
+        store = self.session_store()
+        try:
+            responses = store.responses(store.read(name), self.questionnaire)
+        except (OSError, KeyError, ValueError) as e:
+            messagebox.showerror("Open Session", f"Failed to open session: {str(e)}")
+            return
+        self.start_quiz(responses)
+
+    def reprice_sessions(self):
+        if self.session_store() is None:
+            return
+        if not len(self.sessions):
+            messagebox.showinfo("Re-price Sessions", "There are no saved sessions.")
+            return
+        filename = filedialog.asksaveasfilename(title="Save Re-priced Sessions", defaultextension=".csv",
+                                                initialfile="repriced_sessions.csv",
+                                                filetypes=[("CSV", "*.csv"), ("All files", "*.*")])
+        if not filename:
+            return
+        # The worker reads its own view of the file so later saves on the Tk thread can't race the pass
+        questionnaire = self.snapshot.questionnaire
+        self.worker.submit(
+            lambda task: reprice_sessions(SessionStore(SESSIONS_PATH), questionnaire).to_csv(filename, index=False),
+            on_done=lambda _: messagebox.showinfo("Re-price Sessions",
+                                                  f"Summary saved as:\n{os.path.abspath(filename)}"),
+            on_error=lambda e: messagebox.showerror("Re-price Sessions", f"Failed to re-price sessions: {str(e)}"))
+
+    def toggle_instrumentation(self):
+        INSTRUMENTATION.enabled = self.instrumentation_var.get()
+
+    def show_diagnostics(self):
+        from diagnostics import DiagnosticsWindow
+
+        DiagnosticsWindow(self.root)
+
     def show_about(self):
         messagebox.showinfo("About", "Cloud Cost Calculator\nVersion 1.0\nCreated with Tkinter")
 
     def show_home(self):
         for widget in self.main_frame.winfo_children():
-            widget.destroy()
+            if widget in (self.question_view, self.resutls_view):
+                widget.pack_forget()
+            else:
+                widget.destroy()
 
         ttk.Label(self.main_frame, text="Cloud Cost Calculator", style="Title.TLabel").pack(pady=40)
         self.start_button = ttk.Button(self.main_frame, text=" Start Calculation", image=self.start_img, compound="left",  # Image on the left side
@@ -85,73 +252,82 @@ class CostCalculatorApp:
                                        command=self.start_quiz)
         self.start_button.pack(pady=20, ipadx=20, ipady=15)
 
-    def start_quiz(self):
+    def start_quiz(self, responses=None):
+        if self.pending_snapshot is not None:
+            self.questions = self.pending_snapshot.questions
+            self.answer_index = self.pending_snapshot.answer_index
+            self.questionnaire = self.pending_snapshot.questionnaire
+            self.pending_snapshot = None
         self.current_question = 0
-        self.user_responses = {}
+        self.user_responses = dict(responses or {})
+        self.live_quote = IncrementalQuote(self.model)
+        for q_id, answer in self.user_responses.items():
+            self.live_quote.set_response(q_id, answer)
         self.show_question()
+        self.update_preview()
 
+    @timed("show_question")
     def show_question(self):
+        if self.question_view is None:
+            self.question_view = QuestionView(self.main_frame, self)
         for widget in self.main_frame.winfo_children():
-            widget.destroy()
-
-        q_data = self.questions.iloc[self.current_question]
-        q_text = q_data['Question Text']
-        q_id = q_data['Question ID']
-        input_type = q_data['Input Type']
-
-        ttk.Label(self.main_frame, text=f"Question {self.current_question + 1} of {len(self.questions)}",
-                  style="Title.TLabel").pack(pady=(20, 40))
-
-        container = ttk.Frame(self.main_frame)
-        container.pack(fill=tk.BOTH, expand=True, padx=50)
-        ttk.Label(container, text=q_text, wraplength=600).pack(anchor=tk.W, pady=(0, 20))
-
+            if widget is self.resutls_view:
+                widget.pack_forget()
+            elif widget is not self.question_view:
+                widget.destroy()
+
+        question = self.questions[self.current_question]
+        self.question_view.show_question(self.current_question, len(self.questions), question,
+                                         self.answer_index.get(question[0], ()), self.user_responses)
+        if not self.question_view.winfo_manager():
+            self.question_view.pack(fill=tk.BOTH, expand=True)
+
+    def read_answer(self):
+        q_id, _, input_type = self.questions[self.current_question]
         if input_type == 'Multiple Choice':
-            self.show_radio_buttons(container, q_id)
-        else:
-            self.show_numeric_input(container, q_id)
-
-        nav_frame = ttk.Frame(self.main_frame)
-        nav_frame.pack(pady=20)
-
-        if self.current_question > 0:
-            ttk.Button(nav_frame, text="◀ Back", command=self.prev_question).pack(side=tk.LEFT, padx=10)
-
-        if self.current_question < len(self.questions) - 1:
-            ttk.Button(nav_frame, text="Next ▶", command=self.next_question).pack(side=tk.RIGHT, padx=10)
-        else:
-            ttk.Button(nav_frame, text="📊 Calculate Costs", style="Accent.TButton",
-                       command=self.show_results).pack(side=tk.RIGHT, padx=10)
+            return q_id, self.question_view.var.get()
+        return q_id, float(self.question_view.var.get())
 
-    def show_radio_buttons(self, parent, q_id):
-        answers = self.answers[self.answers['Question ID'] == q_id]
-        self.var = tk.IntVar()
-
-        for idx, row in answers.iterrows():
-            rb = ttk.Radiobutton(parent, text=row['Answer Text'], variable=self.var, value=row['Answer ID'])
-            rb.pack(anchor=tk.W, pady=5)
-            if self.user_responses.get(q_id) == row['Answer ID']:
-                rb.invoke()
+    def save_response(self):
+        try:
+            q_id, answer = self.read_answer()
+        except (ValueError, tk.TclError):
+            messagebox.showerror("Invalid Input", "Please enter a valid number")
+            # The preview may have priced text typed since the last save; go back to what is saved
+            self.restore_live_response(self.questions[self.current_question][0])
+            return False
+        self.user_responses[q_id] = answer
+        self.live_quote.set_response(q_id, answer)
+        self.update_preview()
+        return True
 
-    def show_numeric_input(self, parent, q_id):
-        self.var = tk.StringVar()
+    def restore_live_response(self, q_id):
         if q_id in self.user_responses:
-            self.var.set(self.user_responses[q_id])
-        entry = ttk.Entry(parent, textvariable=self.var, width=15, font=("Arial", 12))
-        entry.pack(anchor=tk.W)
-        entry.focus()
-
-    def save_response(self):
-        q_id = self.questions.iloc[self.current_question]['Question ID']
-        if self.questions.iloc[self.current_question]['Input Type'] == 'Multiple Choice':
-            self.user_responses[q_id] = self.var.get()
+            self.live_quote.set_response(q_id, self.user_responses[q_id])
         else:
-            try:
-                self.user_responses[q_id] = float(self.var.get())
-            except ValueError:
-                messagebox.showerror("Invalid Input", "Please enter a valid number")
-                return False
-        return True
+            self.live_quote.remove_response(q_id)
+        self.update_preview()
+
+    def schedule_preview(self):
+        # Debounced so typing in the numeric entry only recomputes once the user pauses
+        if self.preview_job is not None:
+            self.root.after_cancel(self.preview_job)
+        self.preview_job = self.root.after(PREVIEW_DELAY_MS, self.preview_current_answer)
+
+    def preview_current_answer(self):
+        self.preview_job = None
+        if self.live_quote is None or self.question_view is None:
+            return
+        try:
+            q_id, answer = self.read_answer()
+        except (ValueError, tk.TclError):
+            return
+        self.live_quote.set_response(q_id, answer)
+        self.update_preview()
+
+    def update_preview(self):
+        if self.live_quote is not None and self.question_view is not None:
+            self.question_view.show_preview(self.live_quote.costs())
 
     def next_question(self):
         if not self.save_response():
@@ -164,88 +340,35 @@ class CostCalculatorApp:
         self.current_question -= 1
         self.show_question()
 
-    def calculate_costs(self):
-        ecs_tasks = 0
-        ecs_vcpu = 0
-        ecs_memory = 0
-        connector_tasks = 1
-        eks_nodes = 0
-        data_transfer_multiplier = 1.0
-
-        for q_id, answer_id in self.user_responses.items():
-            if isinstance(answer_id, float):
-                continue
-
-            logic_row = self.logic[(self.logic['Question ID'] == q_id) & (self.logic['Answer ID'] == answer_id)]
-
-            if not logic_row.empty:
-                logic = logic_row.iloc[0]
-                ecs_tasks = max(ecs_tasks, logic['ECS Tasks'])
-                ecs_vcpu = max(ecs_vcpu, logic['ECS vCPU'])
-                ecs_memory = max(ecs_memory, logic['ECS Memory (GB)'])
-                connector_tasks = max(connector_tasks, logic['Connector Tasks'])
-                data_transfer_multiplier *= logic['Data Transfer Multiplier']
-                eks_nodes = max(ecs_tasks, logic['EKS Nodes'])
-
-        duration = self.user_responses.get(4, 0)
-        throughput = self.user_responses.get(2, 0)
-        data_transfer_gb = ((throughput*3600)/1024) * duration * data_transfer_multiplier
-
-        # ECS Calculations
-        ecs_vcpu_cost = ecs_tasks * ecs_vcpu * duration * self.pricing['ECS vCPU Cost per hour']
-        ecs_memory_cost = ecs_tasks * ecs_memory * duration * self.pricing['ECS Memory Cost per GB-hour']
-        ecs_data_transfer_cost = data_transfer_gb * self.pricing['ECS Data Transfer Cost per GB']
-        total_ecs = ecs_vcpu_cost + ecs_memory_cost + ecs_data_transfer_cost
-
-        # Connector Calculations
-        connnector_task_cost = duration * self.pricing['Confluent Cost per task/hour'] * connector_tasks
-        connector_data_transfer_cost = data_transfer_gb * self.pricing['Confluent Data Transfer Cost per GB']
-        total_confluent = connnector_task_cost + connector_data_transfer_cost
-
-        # EKS Calculation
-        eks_cluster_cost = duration * self.pricing['EKS Cluster Cost per hour']
-        eks_node_cost = eks_nodes * duration * self.pricing['EC2 Instance Cost per hour']
-        eks_data_transfer_cost = data_transfer_gb * self.pricing['EC2 Data Transfer Cost per GB']
-        total_eks = eks_cluster_cost + eks_node_cost + eks_data_transfer_cost
-
-        return {
-            'ECS': {
-                'tasks': ecs_tasks,
-                'vcpu': ecs_vcpu,
-                'memory': ecs_memory,
-                'duration': duration,
-                'vcpu_cost': ecs_vcpu_cost,
-                'memory_cost': ecs_memory_cost,
-                'throughput': throughput,
-                'data_transfer_gb': data_transfer_gb,
-                'data_transfer_cost': ecs_data_transfer_cost,
-                'total': total_ecs
-            },
-            'Confluent': {
-                'tasks': connector_tasks,
-                'duration': duration,
-                'task_cost': connnector_task_cost,
-                'throughput': throughput,
-                'data_transfer_gb': data_transfer_gb,
-                'data_transfer_cost': connector_data_transfer_cost,
-                'total': total_confluent
-            },
-            'EKS': {
-                'nodes': eks_nodes,
-                'eks_cluster_cost': eks_cluster_cost,
-                'eks_node_cost': eks_node_cost,
-                'duration': duration,
-                'throughput': throughput,
-                'data_transfer_gb': data_transfer_gb,
-                'data_transfer_cost': eks_data_transfer_cost,
-                'total': total_eks
-            }
-        }
+    @timed("calculate_costs")
+    def calculate_costs(self, responses=None, model=None):
+        if responses is None:
+            responses = self.user_responses
+        # The questionnaire is only used for the cache key while it still matches the model being priced
+        return self.quote_cache.get(responses, model or self.model, self.snapshot.questionnaire)
 
     def show_results(self):
         if not self.save_response():
             return
-        self.resutls_view = Results(self.main_frame, self)
+        if self.calculation_task is not None:
+            self.calculation_task.cancel()
+
+        # Snapshot the inputs so the worker thread never sees a half-edited quiz
+        responses = dict(self.user_responses)
+        model = self.model
+        self.calculation_task = self.worker.submit(
+            lambda task: self.calculate_costs(responses, model),
+            on_done=self.display_results,
+            on_error=lambda e: messagebox.showerror("Error", f"Failed to calculate costs: {str(e)}"))
+
+    def display_results(self, costs):
+        self.calculation_task = None
+        if self.resutls_view is None:
+            from results import Results
+
+            self.resutls_view = Results(self.main_frame, self, costs)
+        else:
+            self.resutls_view.load_result_view(costs)
         self.show_results_view()
 
     def show_results_view(self):
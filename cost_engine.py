@@ -0,0 +1,238 @@
+import hashlib
+
+THROUGHPUT_QUESTION = 2
+DURATION_QUESTION = 4
+
+PRICING_PARAMETERS = (
+    'ECS vCPU Cost per hour',
+    'ECS Memory Cost per GB-hour',
+    'ECS Data Transfer Cost per GB',
+    'Confluent Cost per task/hour',
+    'Confluent Data Transfer Cost per GB',
+    'EKS Cluster Cost per hour',
+    'EC2 Instance Cost per hour',
+    'EC2 Data Transfer Cost per GB',
+)
+
+
+class LogicRecord:
+    __slots__ = ("ecs_tasks", "ecs_vcpu", "ecs_memory", "connector_tasks", "eks_nodes",
+                 "data_transfer_multiplier")
+
+    def __init__(self, ecs_tasks, ecs_vcpu, ecs_memory, connector_tasks, eks_nodes, data_transfer_multiplier):
+        self.ecs_tasks = ecs_tasks
+        self.ecs_vcpu = ecs_vcpu
+        self.ecs_memory = ecs_memory
+        self.connector_tasks = connector_tasks
+        self.eks_nodes = eks_nodes
+        self.data_transfer_multiplier = data_transfer_multiplier
+
+
+class CostModel:
+    __slots__ = ("logic_index", "pricing", "question_ids", "version")
+
+    def __init__(self, logic_index, pricing, question_ids=()):
+        missing = [name for name in PRICING_PARAMETERS if name not in pricing]
+        if missing:
+            raise KeyError(f"Pricing is missing: {', '.join(missing)}")
+        self.logic_index = logic_index
+        self.pricing = {name: float(pricing[name]) for name in PRICING_PARAMETERS}
+        self.question_ids = tuple(question_ids)
+        self.version = model_version(self.logic_index, self.pricing)
+
+
+def model_version(logic_index, pricing):
+    # Changes whenever any input to calculate_costs other than the responses changes
+    digest = hashlib.sha1()
+    for name in PRICING_PARAMETERS:
+        digest.update(f"{name}={pricing[name]!r};".encode())
+    for key in sorted(logic_index, key=repr):
+        record = logic_index[key]
+        values = [getattr(record, field) for field in LogicRecord.__slots__]
+        digest.update(f"{key!r}={values!r};".encode())
+    return digest.hexdigest()[:16]
+
+
+def calculate_costs(responses, model):
+    ecs_tasks = 0
+    ecs_vcpu = 0
+    ecs_memory = 0
+    connector_tasks = 1
+    eks_nodes = 0
+    data_transfer_multiplier = 1.0
+
+    logic_index = model.logic_index
+    for q_id, answer_id in responses.items():
+        if isinstance(answer_id, float):
+            continue
+
+        logic = logic_index.get((q_id, answer_id))
+
+        if logic is not None:
+            ecs_tasks = max(ecs_tasks, logic.ecs_tasks)
+            ecs_vcpu = max(ecs_vcpu, logic.ecs_vcpu)
+            ecs_memory = max(ecs_memory, logic.ecs_memory)
+            connector_tasks = max(connector_tasks, logic.connector_tasks)
+            data_transfer_multiplier *= logic.data_transfer_multiplier
+            eks_nodes = max(ecs_tasks, logic.eks_nodes)
+
+    duration = responses.get(DURATION_QUESTION, 0)
+    throughput = responses.get(THROUGHPUT_QUESTION, 0)
+    return price_costs(ecs_tasks, ecs_vcpu, ecs_memory, connector_tasks, eks_nodes, data_transfer_multiplier,
+                       throughput, duration, model.pricing)
+
+
+def price_costs(ecs_tasks, ecs_vcpu, ecs_memory, connector_tasks, eks_nodes, data_transfer_multiplier,
+                throughput, duration, pricing):
+    data_transfer_gb = ((throughput*3600)/1024) * duration * data_transfer_multiplier
+
+    # ECS Calculations
+    ecs_vcpu_cost = ecs_tasks * ecs_vcpu * duration * pricing['ECS vCPU Cost per hour']
+    ecs_memory_cost = ecs_tasks * ecs_memory * duration * pricing['ECS Memory Cost per GB-hour']
+    ecs_data_transfer_cost = data_transfer_gb * pricing['ECS Data Transfer Cost per GB']
+    total_ecs = ecs_vcpu_cost + ecs_memory_cost + ecs_data_transfer_cost
+
+    # Connector Calculations
+    connnector_task_cost = duration * pricing['Confluent Cost per task/hour'] * connector_tasks
+    connector_data_transfer_cost = data_transfer_gb * pricing['Confluent Data Transfer Cost per GB']
+    total_confluent = connnector_task_cost + connector_data_transfer_cost
+
+    # EKS Calculation
+    eks_cluster_cost = duration * pricing['EKS Cluster Cost per hour']
+    eks_node_cost = eks_nodes * duration * pricing['EC2 Instance Cost per hour']
+    eks_data_transfer_cost = data_transfer_gb * pricing['EC2 Data Transfer Cost per GB']
+    total_eks = eks_cluster_cost + eks_node_cost + eks_data_transfer_cost
+
+    return {
+        'ECS': {
+            'tasks': ecs_tasks,
+            'vcpu': ecs_vcpu,
+            'memory': ecs_memory,
+            'duration': duration,
+            'vcpu_cost': ecs_vcpu_cost,
+            'memory_cost': ecs_memory_cost,
+            'throughput': throughput,
+            'data_transfer_gb': data_transfer_gb,
+            'data_transfer_cost': ecs_data_transfer_cost,
+            'total': total_ecs
+        },
+        'Confluent': {
+            'tasks': connector_tasks,
+            'duration': duration,
+            'task_cost': connnector_task_cost,
+            'throughput': throughput,
+            'data_transfer_gb': data_transfer_gb,
+            'data_transfer_cost': connector_data_transfer_cost,
+            'total': total_confluent
+        },
+        'EKS': {
+            'nodes': eks_nodes,
+            'eks_cluster_cost': eks_cluster_cost,
+            'eks_node_cost': eks_node_cost,
+            'duration': duration,
+            'throughput': throughput,
+            'data_transfer_gb': data_transfer_gb,
+            'data_transfer_cost': eks_data_transfer_cost,
+            'total': total_eks
+        }
+    }
+
+
+RESULT_COLUMNS = (
+    'throughput', 'duration', 'data_transfer_gb',
+    'ecs_tasks', 'ecs_vcpu', 'ecs_memory', 'ecs_vcpu_cost', 'ecs_memory_cost', 'ecs_data_transfer_cost',
+    'ecs_total',
+    'confluent_tasks', 'confluent_task_cost', 'confluent_data_transfer_cost', 'confluent_total',
+    'eks_nodes', 'eks_cluster_cost', 'eks_node_cost', 'eks_data_transfer_cost', 'eks_total',
+)
+
+
+def flatten_costs(costs):
+    ecs, confluent, eks = costs['ECS'], costs['Confluent'], costs['EKS']
+    return {
+        'throughput': ecs['throughput'],
+        'duration': ecs['duration'],
+        'data_transfer_gb': ecs['data_transfer_gb'],
+        'ecs_tasks': ecs['tasks'],
+        'ecs_vcpu': ecs['vcpu'],
+        'ecs_memory': ecs['memory'],
+        'ecs_vcpu_cost': ecs['vcpu_cost'],
+        'ecs_memory_cost': ecs['memory_cost'],
+        'ecs_data_transfer_cost': ecs['data_transfer_cost'],
+        'ecs_total': ecs['total'],
+        'confluent_tasks': confluent['tasks'],
+        'confluent_task_cost': confluent['task_cost'],
+        'confluent_data_transfer_cost': confluent['data_transfer_cost'],
+        'confluent_total': confluent['total'],
+        'eks_nodes': eks['nodes'],
+        'eks_cluster_cost': eks['eks_cluster_cost'],
+        'eks_node_cost': eks['eks_node_cost'],
+        'eks_data_transfer_cost': eks['data_transfer_cost'],
+        'eks_total': eks['total'],
+    }
+
+
+MAX_FIELDS = ("ecs_tasks", "ecs_vcpu", "ecs_memory", "connector_tasks")
+MAX_FIELD_FLOORS = {"ecs_tasks": 0, "ecs_vcpu": 0, "ecs_memory": 0, "connector_tasks": 1}
+
+
+class IncrementalQuote:
+    # Running totals for a quiz in progress. Changing one answer looks up only that question's logic
+    # row and adjusts the max/product aggregates, instead of re-folding every response.
+
+    def __init__(self, model):
+        self.model = model
+        self.order = {q_id: position for position, q_id in enumerate(model.question_ids)}
+        self.responses = {}
+        self.contributions = {}
+        self.maxima = dict(MAX_FIELD_FLOORS)
+        self.data_transfer_multiplier = 1.0
+
+    def set_response(self, q_id, answer_id):
+        self.responses[q_id] = answer_id
+        logic = None
+        if not isinstance(answer_id, float):
+            logic = self.model.logic_index.get((q_id, answer_id))
+        self._replace_contribution(q_id, logic)
+
+    def remove_response(self, q_id):
+        self.responses.pop(q_id, None)
+        self._replace_contribution(q_id, None)
+
+    def _replace_contribution(self, q_id, logic):
+        old = self.contributions.pop(q_id, None)
+        if logic is not None:
+            self.contributions[q_id] = logic
+        if old is logic:
+            return
+
+        for field in MAX_FIELDS:
+            current = self.maxima[field]
+            if logic is not None and getattr(logic, field) >= current:
+                self.maxima[field] = getattr(logic, field)
+            elif old is not None and getattr(old, field) == current:
+                # The removed value may have been the maximum: rescan the remaining contributions
+                self.maxima[field] = max([MAX_FIELD_FLOORS[field]] +
+                                         [getattr(record, field) for record in self.contributions.values()])
+
+        if old is not None and old.data_transfer_multiplier == 0:
+            self.data_transfer_multiplier = 1.0
+            for record in self.contributions.values():
+                self.data_transfer_multiplier *= record.data_transfer_multiplier
+        else:
+            if old is not None:
+                self.data_transfer_multiplier /= old.data_transfer_multiplier
+            if logic is not None:
+                self.data_transfer_multiplier *= logic.data_transfer_multiplier
+
+    def costs(self):
+        eks_nodes = 0
+        if self.contributions:
+            # calculate_costs takes EKS nodes from the last matched answer in questionnaire order
+            last = max(self.contributions, key=lambda q_id: self.order.get(q_id, len(self.order)))
+            eks_nodes = max(self.maxima["ecs_tasks"], self.contributions[last].eks_nodes)
+
+        return price_costs(self.maxima["ecs_tasks"], self.maxima["ecs_vcpu"], self.maxima["ecs_memory"],
+                           self.maxima["connector_tasks"], eks_nodes, self.data_transfer_multiplier,
+                           self.responses.get(THROUGHPUT_QUESTION, 0), self.responses.get(DURATION_QUESTION, 0),
+                           self.model.pricing)
@@ -0,0 +1,53 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+
+from instrumentation import INSTRUMENTATION
+
+COLUMNS = (("name", "Operation", 220), ("calls", "Calls", 70), ("total_ms", "Total (ms)", 100),
+           ("mean_ms", "Mean (ms)", 100), ("max_ms", "Max (ms)", 100))
+
+
+class DiagnosticsWindow(tk.Toplevel):
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.title("Diagnostics")
+        self.geometry("640x360")
+
+        self.status_var = tk.StringVar()
+        ttk.Label(self, textvariable=self.status_var).pack(anchor=tk.W, padx=10)
+
+        self.tree = ttk.Treeview(self, columns=[key for key, _, _ in COLUMNS], show="headings")
+        for key, heading, width in COLUMNS:
+            self.tree.heading(key, text=heading)
+            self.tree.column(key, width=width, anchor=tk.W if key == "name" else tk.E)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        btn_frame = ttk.Frame(self)
+        btn_frame.pack(pady=10)
+        ttk.Button(btn_frame, text="Refresh", command=self.refresh).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Reset", command=self.reset).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Export Trace...", command=self.export_trace).pack(side=tk.LEFT, padx=5)
+        self.refresh()
+
+    def refresh(self):
+        self.status_var.set("Instrumentation is on" if INSTRUMENTATION.enabled
+                            else "Instrumentation is off (Help > Enable Instrumentation)")
+        self.tree.delete(*self.tree.get_children())
+        for row in INSTRUMENTATION.summary():
+            self.tree.insert("", tk.END, values=(row["name"], row["calls"], f"{row['total_ms']:.2f}",
+                                                 f"{row['mean_ms']:.3f}", f"{row['max_ms']:.3f}"))
+
+    def reset(self):
+        INSTRUMENTATION.reset()
+        self.refresh()
+
+    def export_trace(self):
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".json",
+                                            initialfile="idm_trace.json", filetypes=[("Trace JSON", "*.json")])
+        if not path:
+            return
+        try:
+            INSTRUMENTATION.dump(path)
+        except OSError as e:
+            messagebox.showerror("Export Failed", f"Could not write trace: {str(e)}", parent=self)
@@ -1,87 +1,163 @@
 from tkinter import messagebox
-import matplotlib.pyplot as plt
 from reportlab.lib.pagesizes import landscape, letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Table, TableStyle
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib import colors
-import tempfile
+from reportlab.graphics.shapes import Drawing, Group, String
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from concurrent.futures import ProcessPoolExecutor
 import os
 from datetime import datetime
 
+from instrumentation import timed
+
+SERVICES = ['ECS Fargate', 'Confluent Connector', 'EKS with EC2']
+BAR_COLORS = [colors.HexColor('#3498db'), colors.HexColor('#e67e22'), colors.HexColor('#2ecc71')]
+
+# Built once and shared by every report rendered in this process
+STYLES = getSampleStyleSheet()
+BREAKDOWN_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8f9fa')),
+    ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dee2e6')),
+])
+
+
+def report_filename():
+    return f"cost_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+
+
+@timed("export_to_pdf")
 def export_to_pdf(costs):
     try:
-        filename = f"cost_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-        doc = SimpleDocTemplate(filename, pagesize=landscape(letter))
-        elements = []
-        styles = getSampleStyleSheet()
+        filename = report_filename()
+        build_pdf(costs, filename)
+        messagebox.showinfo("Export Successful",
+                            f"Report saved as:\n{os.path.abspath(filename)}")
+    except Exception as e:
+        messagebox.showerror("Export Failed", f"Error generating PDF: {str(e)}")
 
-        # Page 1 - Header and Comparison Chart
-        elements.append(Paragraph("Cloud Cost Analysis Report", styles['Title']))
-        elements.append(Spacer(1, 24))
-        elements.append(Paragraph("Cost Summary", styles['Heading2']))
 
-        # Create and save chart image
-        fig = create_pdf_figure(costs)
-        temp_img = tempfile.NamedTemporaryFile(suffix=".png", delete=False)
-        fig.savefig(temp_img.name, bbox_inches='tight')
-        plt.close(fig)
+@timed("build_pdf")
+def build_pdf(costs, filename, task=None, rate_card_totals=None):
+    # task is an optional worker.Task used to report progress and to abort between pages
+    def report(fraction, message):
+        if task is not None:
+            task.progress(fraction, message)
 
-        # Add chart to first page
-        img = Image(temp_img.name, width=500, height=300)
-        elements.append(img)
-        elements.append(Spacer(1, 24))
+    def on_page(canvas, doc):
+        # The page count isn't known until the build finishes, so each page covers half of what is left before 95%
+        report(0.95 - 0.55 * 0.5 ** doc.page, f"Rendering page {doc.page}")
 
-        # Page Break
-        from reportlab.platypus import PageBreak
-        elements.append(PageBreak())
+    report(0.0, "Preparing report")
+    doc = SimpleDocTemplate(filename, pagesize=landscape(letter))
+    elements = []
 
-        # Page 2 - Detailed Cost Breakdown
-        elements.append(Paragraph("Cost Breakdown", styles['Heading2']))
-        elements.append(Spacer(1, 12))
+    # Page 1 - Header and Comparison Chart
+    elements.append(Paragraph("Cloud Cost Analysis Report", STYLES['Title']))
+    elements.append(Spacer(1, 24))
+    elements.append(Paragraph("Cost Summary", STYLES['Heading2']))
+    elements.append(create_pdf_chart(costs))
+    elements.append(Spacer(1, 24))
+    report(0.2, "Drawing chart")
+
+    # Page Break
+    elements.append(PageBreak())
+
+    # Page 2 - Detailed Cost Breakdown
+    elements.append(Paragraph("Cost Breakdown", STYLES['Heading2']))
+    elements.append(Spacer(1, 12))
+
+    table = Table(create_pdf_table_data(costs), colWidths=[120, 250, 100])
+    table.setStyle(BREAKDOWN_TABLE_STYLE)
+    elements.append(table)
+    elements.append(Spacer(1, 24))
 
-        # Create breakdown table
-        data = create_pdf_table_data(costs)
-        table = Table(data, colWidths=[120, 250, 100])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#f8f9fa')),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#dee2e6')),
-        ]))
+    if rate_card_totals:
+        elements.append(Paragraph("Rate Card Comparison", STYLES['Heading2']))
+        elements.append(Spacer(1, 12))
+        table = Table(create_pdf_rate_card_data(rate_card_totals), repeatRows=1)
+        table.setStyle(BREAKDOWN_TABLE_STYLE)
         elements.append(table)
         elements.append(Spacer(1, 24))
+    report(0.4, "Laying out tables")
 
-        # Generate PDF
-        doc.build(elements)
-        temp_img.close()
-        os.unlink(temp_img.name)
+    try:
+        doc.build(elements, onFirstPage=on_page, onLaterPages=on_page)
+    except BaseException:
+        # Don't leave a half-written report behind after a cancel or failure
+        if os.path.exists(filename):
+            os.unlink(filename)
+        raise
+    report(1.0, "Done")
+    return filename
+
+
+def _build_pdf_job(job):
+    return build_pdf(*job)
 
-        messagebox.showinfo("Export Successful",
-                            f"Report saved as:\n{os.path.abspath(filename)}")
-    except Exception as e:
-        messagebox.showerror("Export Failed", f"Error generating PDF: {str(e)}")
 
-def create_pdf_figure(costs):
-    fig = plt.Figure(figsize=(8, 4), dpi=100)
-    ax = fig.add_subplot(111)
-    services = ['ECS Fargate', 'Confluent Connector', 'EKS with EC2']
+def export_reports(costs_list, output_dir, names=None, workers=1):
+    os.makedirs(output_dir, exist_ok=True)
+    costs_list = list(costs_list)
+    if names is None:
+        names = [f"cost_report_{index:05d}" for index in range(len(costs_list))]
+    jobs = [(costs, os.path.join(output_dir, f"{name}.pdf")) for costs, name in zip(costs_list, names)]
+
+    if workers <= 1:
+        return [build_pdf(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_build_pdf_job, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+
+
+def create_pdf_chart(costs, width=500, height=300):
+    # Drawn with reportlab vector graphics, so no matplotlib figure or temp PNG is needed
     costs_total = [costs['ECS']['total'], costs['Confluent']['total'], costs['EKS']['total']]
-    colors = ['#3498db', '#e67e22', '#2ecc71']
-
-    bars = ax.bar(services, costs_total, color=colors)
-    ax.set_title('Cost Summary', fontsize=12)
-    ax.set_ylabel('USD ($)', fontsize=10)
-    ax.tick_params(axis='both', which='major', labelsize=8)
-
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width() / 2., height,
-                f'${height:.2f}', ha='center', va='bottom', fontsize=8)
-    return fig
+    drawing = Drawing(width, height)
+
+    chart = VerticalBarChart()
+    chart.x = 60
+    chart.y = 40
+    chart.width = width - 80
+    chart.height = height - 80
+    chart.data = [costs_total]
+    chart.barWidth = 30
+    chart.groupSpacing = 40
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.labels.fontName = 'Helvetica'
+    chart.valueAxis.labels.fontSize = 8
+    chart.categoryAxis.categoryNames = SERVICES
+    chart.categoryAxis.labels.fontName = 'Helvetica'
+    chart.categoryAxis.labels.fontSize = 8
+    chart.barLabelFormat = '$%.2f'
+    chart.barLabels.fontName = 'Helvetica'
+    chart.barLabels.fontSize = 8
+    chart.barLabels.nudge = 8
+    chart.bars.strokeColor = None
+    for index, color in enumerate(BAR_COLORS):
+        chart.bars[(0, index)].fillColor = color
+    drawing.add(chart)
+
+    drawing.add(String(width / 2, height - 20, 'Cost Summary', fontName='Helvetica', fontSize=12, textAnchor='middle'))
+    y_label = Group(String(0, 0, 'USD ($)', fontName='Helvetica', fontSize=10, textAnchor='middle'))
+    y_label.transform = (0, 1, -1, 0, 15, chart.y + chart.height / 2)
+    drawing.add(y_label)
+    return drawing
+
+
+def create_pdf_rate_card_data(rate_card_totals):
+    # rate_card_totals is rate_cards.compare_rate_cards output: {service key: {card: total}}
+    cards = list(rate_card_totals['ECS'])
+    data = [["Service"] + cards]
+    for service, key in zip(SERVICES, ('ECS', 'Confluent', 'EKS')):
+        data.append([service] + [f"${rate_card_totals[key][card]:.2f}" for card in cards])
+    return data
+
 
 def create_pdf_table_data(costs):
     data = [
@@ -0,0 +1,49 @@
+from workbook import WORKBOOK_PATH, file_stamp, load_snapshot
+
+POLL_INTERVAL_MS = 2000
+
+
+class WorkbookWatcher:
+    # Polls the workbook's mtime/size. A change is only reported once the file has looked the same on two
+    # consecutive polls, so a reload never reads a half-saved workbook. Loading is left to the caller,
+    # which runs it off its UI/event-loop thread.
+
+    def __init__(self, path=WORKBOOK_PATH, stamp=None):
+        self.path = path
+        self.stamp = stamp if stamp is not None else file_stamp(path)
+        self.pending_stamp = None
+        self.reloading_stamp = None
+        self.reloading = False
+
+    def poll(self):
+        if self.reloading:
+            return False
+        try:
+            stamp = file_stamp(self.path)
+        except OSError:
+            # Mid-save editors briefly remove the file; check again on the next poll
+            return False
+        if stamp == self.stamp:
+            self.pending_stamp = None
+            return False
+        if stamp != self.pending_stamp:
+            self.pending_stamp = stamp
+            return False
+        self.reloading = True
+        self.reloading_stamp = stamp
+        return True
+
+    def load(self):
+        # Safe to call from a worker thread; raises if the new workbook fails validation
+        return load_snapshot(self.path)
+
+    def accept(self, snapshot):
+        self.stamp = snapshot.stamp
+        self.pending_stamp = None
+        self.reloading = False
+
+    def reject(self):
+        # Keep the current model and don't retry this version of the file until it changes again
+        self.stamp = self.reloading_stamp
+        self.pending_stamp = None
+        self.reloading = False
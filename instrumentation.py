@@ -0,0 +1,89 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+ENABLE_ENV_VAR = "IDM_PROFILE"
+TRACE_ENV_VAR = "IDM_PROFILE_TRACE"
+MAX_EVENTS = 100_000
+
+
+class Instrumentation:
+    # Call counts and timings for the app's hot paths. When disabled a wrapped call costs one attribute check.
+
+    def __init__(self, enabled=False, max_events=MAX_EVENTS):
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.stats = {}
+        self.events = deque(maxlen=max_events)
+        self._lock = threading.Lock()
+
+    def timed(self, name):
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self.record(name, start, time.perf_counter())
+            return wrapper
+        return decorator
+
+    def record(self, name, start, end):
+        duration = end - start
+        with self._lock:
+            stat = self.stats.get(name)
+            if stat is None:
+                stat = self.stats[name] = [0, 0.0, 0.0]
+            stat[0] += 1
+            stat[1] += duration
+            stat[2] = max(stat[2], duration)
+            self.events.append((name, start, duration, threading.get_ident()))
+
+    def summary(self):
+        with self._lock:
+            return [{"name": name, "calls": calls, "total_ms": total * 1000, "mean_ms": total / calls * 1000,
+                     "max_ms": longest * 1000}
+                    for name, (calls, total, longest) in sorted(self.stats.items())]
+
+    def reset(self):
+        with self._lock:
+            self.stats.clear()
+            self.events.clear()
+
+    def trace_events(self):
+        # Chrome trace-event format: loads in chrome://tracing, Perfetto and speedscope
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+        return {
+            "traceEvents": [{"name": name, "cat": "idm", "ph": "X", "pid": pid, "tid": tid,
+                             "ts": (start - self.origin) * 1e6, "dur": duration * 1e6}
+                            for name, start, duration, tid in events],
+            "displayTimeUnit": "ms",
+            "otherData": {"summary": self.summary()},
+        }
+
+    def dump(self, path):
+        with open(path, "w") as f:
+            json.dump(self.trace_events(), f)
+        return path
+
+
+INSTRUMENTATION = Instrumentation(enabled=os.environ.get(ENABLE_ENV_VAR, "") not in ("", "0"))
+timed = INSTRUMENTATION.timed
+
+
+def _dump_at_exit():
+    path = os.environ.get(TRACE_ENV_VAR)
+    if path and INSTRUMENTATION.events:
+        INSTRUMENTATION.dump(path)
+
+
+atexit.register(_dump_at_exit)
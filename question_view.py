@@ -0,0 +1,97 @@
+import tkinter as tk
+from tkinter import ttk
+
+PREVIEW_SERVICES = (('ECS', 'ECS Fargate'), ('Confluent', 'Confluent Connector'), ('EKS', 'EKS with EC2'))
+
+
+class QuestionView(ttk.Frame):
+    # Built once; navigating only updates texts and options, so latency doesn't grow with the questionnaire
+
+    def __init__(self, parent, controller):
+        super().__init__(parent)
+        self.controller = controller
+        self.choice_var = tk.IntVar()
+        self.number_var = tk.StringVar()
+        self.var = self.choice_var
+        self.choice_var.trace_add("write", lambda *_: controller.schedule_preview())
+        self.number_var.trace_add("write", lambda *_: controller.schedule_preview())
+        self.radio_buttons = []
+        self.visible_answers = 0
+
+        self.title_label = ttk.Label(self, style="Title.TLabel")
+        self.title_label.pack(pady=(20, 40))
+
+        container = ttk.Frame(self)
+        container.pack(fill=tk.BOTH, expand=True, padx=50)
+        self.question_label = ttk.Label(container, wraplength=600)
+        self.question_label.pack(anchor=tk.W, pady=(0, 20))
+
+        self.options_frame = ttk.Frame(container)
+        self.options_frame.pack(fill=tk.X)
+        self.entry = ttk.Entry(self.options_frame, textvariable=self.number_var, width=15, font=("Arial", 12))
+
+        preview_frame = ttk.LabelFrame(self, text="Running estimate")
+        preview_frame.pack(padx=50, pady=(10, 0), fill=tk.X)
+        self.preview_labels = {}
+        for key, service in PREVIEW_SERVICES:
+            self.preview_labels[key] = ttk.Label(preview_frame, text=f"{service}: -")
+            self.preview_labels[key].pack(side=tk.LEFT, expand=True)
+
+        nav_frame = ttk.Frame(self)
+        nav_frame.pack(pady=20)
+        self.back_button = ttk.Button(nav_frame, text="◀ Back", command=controller.prev_question)
+        self.next_button = ttk.Button(nav_frame, text="Next ▶", command=controller.next_question)
+        self.calculate_button = ttk.Button(nav_frame, text="📊 Calculate Costs", style="Accent.TButton",
+                                           command=controller.show_results)
+
+    def show_question(self, index, total, question, answers, responses):
+        q_id, q_text, input_type = question
+
+        self.title_label.configure(text=f"Question {index + 1} of {total}")
+        self.question_label.configure(text=q_text)
+
+        if input_type == 'Multiple Choice':
+            self.entry.pack_forget()
+            self.show_radio_buttons(answers, responses.get(q_id, 0))
+        else:
+            self.show_radio_buttons((), 0)
+            self.show_numeric_input(responses.get(q_id, ""))
+
+        if index > 0:
+            self.back_button.pack(side=tk.LEFT, padx=10)
+        else:
+            self.back_button.pack_forget()
+
+        if index < total - 1:
+            self.calculate_button.pack_forget()
+            self.next_button.pack(side=tk.RIGHT, padx=10)
+        else:
+            self.next_button.pack_forget()
+            self.calculate_button.pack(side=tk.RIGHT, padx=10)
+
+    def show_radio_buttons(self, answers, selected):
+        self.var = self.choice_var
+        self.choice_var.set(selected)
+
+        while len(self.radio_buttons) < len(answers):
+            self.radio_buttons.append(ttk.Radiobutton(self.options_frame, variable=self.choice_var))
+
+        for rb, (answer_id, answer_text) in zip(self.radio_buttons, answers):
+            rb.configure(text=answer_text, value=answer_id)
+
+        # Only widgets whose visibility changes are re-packed; pooled buttons stay in pack order
+        for rb in self.radio_buttons[self.visible_answers:len(answers)]:
+            rb.pack(anchor=tk.W, pady=5)
+        for rb in self.radio_buttons[len(answers):self.visible_answers]:
+            rb.pack_forget()
+        self.visible_answers = len(answers)
+
+    def show_numeric_input(self, value):
+        self.var = self.number_var
+        self.number_var.set(value)
+        self.entry.pack(anchor=tk.W)
+        self.entry.focus()
+
+    def show_preview(self, costs):
+        for key, service in PREVIEW_SERVICES:
+            self.preview_labels[key].configure(text=f"{service}: ${costs[key]['total']:,.2f}")
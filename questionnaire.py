@@ -0,0 +1,140 @@
+import hashlib
+import math
+from array import array
+
+from cost_engine import DURATION_QUESTION, THROUGHPUT_QUESTION, LogicRecord, price_costs
+
+UNANSWERED = 0
+CODE_TYPE = 'i'
+NUMBER_TYPE = 'd'
+
+
+class CompiledQuestionnaire:
+    # Question and answer IDs mapped to dense codes, and the Logic sheet held in flat typed arrays.
+    # A set of responses becomes two fixed-size vectors: one answer code per choice question
+    # (0 = unanswered, n = the question's n-th answer) and one float per numeric question (NaN = unanswered).
+    __slots__ = ("slots", "positions", "choice_questions", "numeric_questions", "answer_ids", "answer_codes", "offsets",
+                 "has_logic", "logic", "pricing", "model_version", "layout")
+
+    def __init__(self, questions, answer_index, model):
+        by_question = {}
+        for q_id, answer_id in model.logic_index:
+            by_question.setdefault(q_id, []).append(answer_id)
+
+        self.slots = []
+        choice_questions, numeric_questions = [], []
+        for q_id, _, input_type in questions:
+            if input_type == 'Numeric':
+                self.slots.append((q_id, False, len(numeric_questions)))
+                numeric_questions.append(q_id)
+            else:
+                self.slots.append((q_id, True, len(choice_questions)))
+                choice_questions.append(q_id)
+        # calculate_costs still applies Logic rows of questions missing from the Questions sheet
+        for q_id in sorted(q_id for q_id in by_question if q_id not in choice_questions + numeric_questions):
+            self.slots.append((q_id, True, len(choice_questions)))
+            choice_questions.append(q_id)
+        self.choice_questions = tuple(choice_questions)
+        self.numeric_questions = tuple(numeric_questions)
+        self.positions = {q_id: (is_choice, position) for q_id, is_choice, position in self.slots}
+
+        typecodes = {}
+        for field in LogicRecord.__slots__:
+            values = [getattr(record, field) for record in model.logic_index.values()]
+            typecodes[field] = 'q' if all(isinstance(value, int) for value in values) else 'd'
+
+        self.answer_ids = []
+        self.answer_codes = []
+        self.offsets = array('q')
+        self.has_logic = array('b')
+        self.logic = {field: array(typecodes[field]) for field in LogicRecord.__slots__}
+        for q_id in self.choice_questions:
+            ids = [answer_id for answer_id, _ in answer_index.get(q_id, ())]
+            listed = set(ids)
+            ids += sorted(answer_id for answer_id in by_question.get(q_id, ()) if answer_id not in listed)
+
+            self.answer_ids.append(tuple(ids))
+            self.answer_codes.append({answer_id: code for code, answer_id in enumerate(ids, 1)})
+            self.offsets.append(len(self.has_logic))
+            for answer_id in ids:
+                record = model.logic_index.get((q_id, answer_id))
+                self.has_logic.append(record is not None)
+                for field, values in self.logic.items():
+                    values.append(getattr(record, field) if record is not None else 0)
+
+        self.pricing = model.pricing
+        self.model_version = model.version
+        self.layout = layout_version(self.choice_questions, self.numeric_questions, self.answer_ids)
+
+    def encode(self, responses, strict=True):
+        codes = array(CODE_TYPE, [UNANSWERED]) * len(self.choice_questions)
+        numbers = array(NUMBER_TYPE, [math.nan]) * len(self.numeric_questions)
+        positions = self.positions
+        for q_id, answer in responses.items():
+            if q_id not in positions:
+                continue
+            is_choice, position = positions[q_id]
+            if not is_choice:
+                numbers[position] = float(answer)
+            elif not isinstance(answer, float):
+                # Float answers never match a Logic row, so they encode as unanswered like the engine treats them.
+                # So does the 0 the GUI stores for a skipped question; any other unknown answer is only
+                # left unanswered by non-strict encoding.
+                code = self.answer_codes[position].get(answer)
+                if code is None and strict and answer != UNANSWERED:
+                    raise ValueError(f"{answer!r} is not an answer to question {q_id}")
+                codes[position] = code or UNANSWERED
+        return codes, numbers
+
+    def decode(self, codes, numbers):
+        # Back to the dict the GUI keeps, in questionnaire order
+        responses = {}
+        for q_id, is_choice, position in self.slots:
+            if is_choice:
+                if codes[position] != UNANSWERED:
+                    responses[q_id] = self.answer_ids[position][codes[position] - 1]
+            elif not math.isnan(numbers[position]):
+                responses[q_id] = numbers[position]
+        return responses
+
+    def key(self, codes, numbers):
+        return codes.tobytes() + numbers.tobytes()
+
+    def number(self, numbers, q_id):
+        if q_id not in self.numeric_questions:
+            return 0
+        value = numbers[self.numeric_questions.index(q_id)]
+        return 0 if math.isnan(value) else value
+
+    def costs(self, codes, numbers):
+        ecs_tasks = 0
+        ecs_vcpu = 0
+        ecs_memory = 0
+        connector_tasks = 1
+        eks_nodes = 0
+        data_transfer_multiplier = 1.0
+
+        # Choice questions fold in questionnaire order, so the last matched answer sets EKS nodes as in the GUI
+        logic = self.logic
+        for position, code in enumerate(codes):
+            if code == UNANSWERED:
+                continue
+            row = self.offsets[position] + code - 1
+            if not self.has_logic[row]:
+                continue
+            ecs_tasks = max(ecs_tasks, logic['ecs_tasks'][row])
+            ecs_vcpu = max(ecs_vcpu, logic['ecs_vcpu'][row])
+            ecs_memory = max(ecs_memory, logic['ecs_memory'][row])
+            connector_tasks = max(connector_tasks, logic['connector_tasks'][row])
+            data_transfer_multiplier *= logic['data_transfer_multiplier'][row]
+            eks_nodes = max(ecs_tasks, logic['eks_nodes'][row])
+
+        return price_costs(ecs_tasks, ecs_vcpu, ecs_memory, connector_tasks, eks_nodes, data_transfer_multiplier,
+                           self.number(numbers, THROUGHPUT_QUESTION), self.number(numbers, DURATION_QUESTION),
+                           self.pricing)
+
+
+def layout_version(choice_questions, numeric_questions, answer_ids):
+    # Codes from one questionnaire only mean the same answers in another with the same layout
+    digest = hashlib.sha1(f"{choice_questions!r};{numeric_questions!r};{answer_ids!r}".encode())
+    return digest.hexdigest()[:16]
@@ -0,0 +1,82 @@
+import threading
+from collections import OrderedDict
+
+from cost_engine import calculate_costs
+
+DEFAULT_CACHE_SIZE = 256
+
+
+def normalize_responses(responses, question_ids=()):
+    # Questionnaire order first (the order calculate_costs folds answers in), then any extras.
+    # Floats and ints are kept apart because the engine treats float answers as numeric input.
+    order = {q_id: position for position, q_id in enumerate(question_ids)}
+    items = sorted(((int(q_id), answer) for q_id, answer in responses.items()),
+                   key=lambda item: (order.get(item[0], len(order)), item[0]))
+    return tuple((q_id, float(answer)) if isinstance(answer, float) else (q_id, int(answer))
+                 for q_id, answer in items)
+
+
+class QuoteCache:
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.model_version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, responses, model, questionnaire=None):
+        if questionnaire is not None and questionnaire.model_version != model.version:
+            questionnaire = None
+        if questionnaire is not None:
+            # The compiled code vectors make a short bytes key, cheaper to build and hash than sorted tuples
+            codes, numbers = questionnaire.encode(responses, strict=False)
+            key = questionnaire.key(codes, numbers)
+        else:
+            key = normalize_responses(responses, model.question_ids)
+        with self._lock:
+            if model.version != self.model_version:
+                self._invalidate(model.version)
+            costs = self._entries.get(key)
+            if costs is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return costs
+            self.misses += 1
+
+        if questionnaire is not None:
+            costs = questionnaire.costs(codes, numbers)
+        else:
+            costs = calculate_costs(dict(key), model)
+
+        with self._lock:
+            if model.version == self.model_version and self.maxsize > 0:
+                self._entries[key] = costs
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return costs
+
+    def _invalidate(self, version):
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+        self.model_version = version
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "model_version": self.model_version,
+            }
@@ -0,0 +1,248 @@
+import argparse
+import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+from cli import _init_worker, _price_chunk, chunked, price_rows, row_responses
+from cost_engine import flatten_costs
+from hot_reload import POLL_INTERVAL_MS, WorkbookWatcher
+from quote_cache import DEFAULT_CACHE_SIZE, QuoteCache
+from workbook import WORKBOOK_PATH, load_snapshot
+
+MAX_BODY_BYTES = 64 * 1024 * 1024
+# Lines are already capped by the stream reader's 64 KiB limit; this caps how many headers one request can send
+MAX_HEADER_LINES = 100
+# Bodies up to this many scenarios are priced on the event loop through the quote cache;
+# anything larger is split into chunks and priced in the process pool
+INLINE_LIMIT = 16
+CHUNK_SIZE = 1000
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large",
+               414: "URI Too Long", 431: "Request Header Fields Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class QuoteService:
+    def __init__(self, model, workers=1, cache_size=DEFAULT_CACHE_SIZE, questionnaire=None):
+        self.model = model
+        self.questionnaire = questionnaire
+        self.workers = workers
+        self.cache = QuoteCache(cache_size)
+        self.pool = None
+        self.requests = 0
+
+    def start_pool(self):
+        if self.workers > 0:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                            initargs=(self.model,))
+
+    def swap_model(self, model, questionnaire=None):
+        # Requests already running hold the old model/pool and finish on them; the old pool drains and exits
+        old_pool = self.pool
+        self.model = model
+        self.questionnaire = questionnaire
+        self.start_pool()
+        if old_pool is not None:
+            old_pool.shutdown(wait=False)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+
+    def quote_inline(self, rows, model, questionnaire=None):
+        choice_questions = {q_id for q_id, _ in model.logic_index}
+        results = []
+        for row in rows:
+            result = {key: value for key, value in row.items() if not str(key).isdigit()}
+            try:
+                costs = self.cache.get(row_responses(row, choice_questions, model.question_ids), model,
+                                       questionnaire)
+            except (TypeError, ValueError, OverflowError) as e:
+                result["error"] = str(e)
+            else:
+                result.update(flatten_costs(costs))
+            results.append(result)
+        return results
+
+    async def quote(self, rows):
+        # Every chunk of one request is priced against the same model, even if a reload lands mid-request
+        model, questionnaire, pool = self.model, self.questionnaire, self.pool
+        if len(rows) <= INLINE_LIMIT:
+            return self.quote_inline(rows, model, questionnaire)
+
+        loop = asyncio.get_running_loop()
+        if pool is None:
+            return await loop.run_in_executor(None, price_rows, rows, model)
+        parts = await asyncio.gather(*(loop.run_in_executor(pool, _price_chunk, chunk)
+                                       for chunk in chunked(rows, CHUNK_SIZE)))
+        return [result for part in parts for result in part]
+
+    async def handle(self, method, path, body):
+        if path == "/health":
+            if method != "GET":
+                raise HTTPError(405, "use GET")
+            return {"status": "ok", "model_version": self.model.version}
+
+        if path == "/stats":
+            if method != "GET":
+                raise HTTPError(405, "use GET")
+            return {"requests": self.requests, "cache": self.cache.stats()}
+
+        if path == "/quote":
+            if method != "POST":
+                raise HTTPError(405, "use POST")
+            try:
+                payload = json.loads(body or b"null")
+            except ValueError as e:
+                raise HTTPError(400, f"invalid JSON: {e}")
+
+            # A single scenario object gets a single result; a list (or {"scenarios": [...]}) is a batch
+            if isinstance(payload, dict) and isinstance(payload.get("scenarios"), list):
+                payload = payload["scenarios"]
+            if isinstance(payload, dict):
+                return (await self.quote([payload]))[0]
+            if isinstance(payload, list) and all(isinstance(row, dict) for row in payload):
+                return {"results": await self.quote(payload)}
+            raise HTTPError(400, "expected a scenario object or a list of scenario objects")
+
+        raise HTTPError(404, f"no route for {path}")
+
+    async def serve_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                except ValueError:
+                    # readline raises this when the line overruns the reader's limit
+                    await self.respond(writer, 414, {"error": "request line too long"}, keep_alive=False)
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self.respond(writer, 400, {"error": "malformed request line"}, keep_alive=False)
+                    break
+
+                try:
+                    headers = await self.read_headers(reader)
+                except HTTPError as e:
+                    await self.respond(writer, e.status, {"error": e.message}, keep_alive=False)
+                    break
+
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self.respond(writer, 400, {"error": "invalid Content-Length"}, keep_alive=False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self.respond(writer, 413, {"error": "request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                self.requests += 1
+                try:
+                    status, payload = 200, await self.handle(method, path.split("?", 1)[0], body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": e.message}
+                except Exception as e:
+                    status, payload = 500, {"error": str(e)}
+                await self.respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def read_headers(self, reader):
+        headers = {}
+        for _ in range(MAX_HEADER_LINES + 1):
+            try:
+                line = await reader.readline()
+            except ValueError:
+                raise HTTPError(431, "header line too long")
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        raise HTTPError(431, f"more than {MAX_HEADER_LINES} header lines")
+
+    async def respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        head = (f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+
+async def watch_workbook(service, watcher):
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(POLL_INTERVAL_MS / 1000)
+        if not watcher.poll():
+            continue
+        try:
+            snapshot = await loop.run_in_executor(None, watcher.load)
+        except Exception as e:
+            watcher.reject()
+            print(f"Workbook reload failed, keeping model {service.model.version}: {e}", flush=True)
+        else:
+            watcher.accept(snapshot)
+            service.swap_model(snapshot.model, snapshot.questionnaire)
+            print(f"Reloaded workbook, now serving model {snapshot.model.version}", flush=True)
+
+
+async def serve(service, host, port, watcher=None):
+    service.start_pool()
+    server = await asyncio.start_server(service.serve_connection, host, port)
+    addresses = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"Serving quotes on {addresses}", flush=True)
+    watch_task = asyncio.create_task(watch_workbook(service, watcher)) if watcher is not None else None
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if watch_task is not None:
+            watch_task.cancel()
+        service.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve cloud cost quotes over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes used for large batch bodies (0 prices them on a thread)")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE)
+    parser.add_argument("--workbook", default=WORKBOOK_PATH, help="pricing workbook to load")
+    parser.add_argument("--no-reload", action="store_true", help="don't watch the workbook for changes")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    snapshot = load_snapshot(args.workbook)
+    service = QuoteService(snapshot.model, workers=args.workers, cache_size=args.cache_size,
+                           questionnaire=snapshot.questionnaire)
+    watcher = None if args.no_reload else WorkbookWatcher(args.workbook, snapshot.stamp)
+    try:
+        asyncio.run(serve(service, args.host, args.port, watcher))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import numpy as np
+
+from cost_engine import PRICING_PARAMETERS
+
+SERVICES = ('ECS', 'Confluent', 'EKS')
+SERVICE_NAMES = {'ECS': 'ECS Fargate', 'Confluent': 'Confluent Connector', 'EKS': 'EKS with EC2'}
+PARAMETER_INDEX = {name: position for position, name in enumerate(PRICING_PARAMETERS)}
+
+
+class RateCardMatrix:
+    # Prices as a (parameter x rate card) matrix so every card is priced by one matrix product
+    __slots__ = ("names", "prices")
+
+    def __init__(self, rate_cards):
+        self.names = tuple(rate_cards)
+        self.prices = np.array([[float(rate_cards[card][name]) for card in self.names]
+                                for name in PRICING_PARAMETERS], dtype=np.float64)
+
+
+def usage_matrix(costs):
+    # (service x parameter) usage quantities behind a quote: vCPU-hours, GB-hours, task/node-hours, GB moved
+    usage = np.zeros((len(SERVICES), len(PRICING_PARAMETERS)))
+    ecs, confluent, eks = costs['ECS'], costs['Confluent'], costs['EKS']
+
+    usage[0, PARAMETER_INDEX['ECS vCPU Cost per hour']] = ecs['tasks'] * ecs['vcpu'] * ecs['duration']
+    usage[0, PARAMETER_INDEX['ECS Memory Cost per GB-hour']] = ecs['tasks'] * ecs['memory'] * ecs['duration']
+    usage[0, PARAMETER_INDEX['ECS Data Transfer Cost per GB']] = ecs['data_transfer_gb']
+
+    usage[1, PARAMETER_INDEX['Confluent Cost per task/hour']] = confluent['tasks'] * confluent['duration']
+    usage[1, PARAMETER_INDEX['Confluent Data Transfer Cost per GB']] = confluent['data_transfer_gb']
+
+    usage[2, PARAMETER_INDEX['EKS Cluster Cost per hour']] = eks['duration']
+    usage[2, PARAMETER_INDEX['EC2 Instance Cost per hour']] = eks['nodes'] * eks['duration']
+    usage[2, PARAMETER_INDEX['EC2 Data Transfer Cost per GB']] = eks['data_transfer_gb']
+    return usage
+
+
+def compare_rate_cards(costs, matrix):
+    totals = usage_matrix(costs) @ matrix.prices
+    return {service: dict(zip(matrix.names, totals[row].tolist())) for row, service in enumerate(SERVICES)}
+
+
+def batch_usage(results):
+    # Same quantities for a quote_batch result frame: (scenario x service x parameter)
+    usage = np.zeros((len(results), len(SERVICES), len(PRICING_PARAMETERS)))
+    duration = results['duration'].to_numpy(dtype=np.float64)
+    data_transfer_gb = results['data_transfer_gb'].to_numpy(dtype=np.float64)
+
+    usage[:, 0, PARAMETER_INDEX['ECS vCPU Cost per hour']] = results['ecs_tasks'] * results['ecs_vcpu'] * duration
+    usage[:, 0, PARAMETER_INDEX['ECS Memory Cost per GB-hour']] = results['ecs_tasks'] * results['ecs_memory'] * duration
+    usage[:, 0, PARAMETER_INDEX['ECS Data Transfer Cost per GB']] = data_transfer_gb
+
+    usage[:, 1, PARAMETER_INDEX['Confluent Cost per task/hour']] = results['confluent_tasks'] * duration
+    usage[:, 1, PARAMETER_INDEX['Confluent Data Transfer Cost per GB']] = data_transfer_gb
+
+    usage[:, 2, PARAMETER_INDEX['EKS Cluster Cost per hour']] = duration
+    usage[:, 2, PARAMETER_INDEX['EC2 Instance Cost per hour']] = results['eks_nodes'] * duration
+    usage[:, 2, PARAMETER_INDEX['EC2 Data Transfer Cost per GB']] = data_transfer_gb
+    return usage
+
+
+def batch_compare_rate_cards(results, matrix):
+    import pandas as pd
+
+    totals = batch_usage(results) @ matrix.prices
+    columns = {f"{service.lower()}_total[{card}]": totals[:, row, col]
+               for row, service in enumerate(SERVICES) for col, card in enumerate(matrix.names)}
+    return pd.DataFrame(columns, index=results.index)
@@ -1,130 +1,259 @@
+import os
 import tkinter as tk
-from tkinter import ttk
-import matplotlib.pyplot as plt
+from tkinter import ttk, messagebox
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-from export_report import export_to_pdf
+from instrumentation import timed
+from rate_cards import RateCardMatrix, compare_rate_cards
+
+SERVICES = ['ECS Fargate', 'Confluent Connector', 'EKS with EC2']
+SERVICE_KEYS = ['ECS', 'Confluent', 'EKS']
+
 
 class Results(ttk.Frame):
+    # One results window per app: recalculating updates the chart and tables in place instead of
+    # creating a new Toplevel, Figure and canvas every time
 
-    def __init__(self, parent, controller):
+    def __init__(self, parent, controller, costs=None):
         super().__init__(parent)
         self.controller = controller
-        self.load_result_view()
+        self.costs = None
+        self.results_window = None
+        self.export_task = None
+        self.rate_card_matrix = None
+        self.rate_card_source = None
+        self.rate_card_totals = None
+        self.load_result_view(costs)
 
-    def load_result_view(self):
-        costs = self.controller.calculate_costs()
+    @timed("Results.load_result_view")
+    def load_result_view(self, costs=None):
+        if costs is None:
+            costs = self.controller.calculate_costs()
+        self.costs = costs
+        if self.results_window is None:
+            self.build_result_window()
+        self.update_comparison_frame(self.costs)
+        self.update_breakdown_frame(self.costs)
+        self.update_rate_card_frame(self.costs)
+        self.results_window.deiconify()
+        self.results_window.lift()
+
+    def build_result_window(self):
         results_window = tk.Toplevel(self.controller.root)
         results_window.title("Cost Calculation Results")
         results_window.geometry("1000x700")  # Match main window size
         # results_window.state("zoomed")
+        results_window.protocol("WM_DELETE_WINDOW", results_window.withdraw)
+        self.results_window = results_window
 
         notebook = ttk.Notebook(results_window)
         notebook.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
         comparison_frame = ttk.Frame(notebook)
-        self.create_comparison_frame(comparison_frame, costs)
+        self.create_comparison_frame(comparison_frame)
         notebook.add(comparison_frame, text="Cost Summary")
 
         breakdown_frame = ttk.Frame(notebook)
-        self.create_breakdown_frame(breakdown_frame, costs)
+        self.create_breakdown_frame(breakdown_frame)
         notebook.add(breakdown_frame, text="Cost Breakdown")
 
+        rate_card_frame = ttk.Frame(notebook)
+        self.create_rate_card_frame(rate_card_frame)
+        notebook.add(rate_card_frame, text="Rate Cards")
+
         btn_frame = ttk.Frame(results_window)
         btn_frame.pack(pady=20)
-        ttk.Button(btn_frame, text="🏠 Home", command=lambda: [results_window.destroy(), self.controller.show_home()]).pack(
+        ttk.Button(btn_frame, text="🏠 Home", command=lambda: [results_window.withdraw(), self.controller.show_home()]).pack(
             side=tk.LEFT, padx=10)
-        ttk.Button(btn_frame, text="🔄 New Calculation", command=lambda: [results_window.destroy(), self.controller.start_quiz()]).pack(side=tk.LEFT, padx=10)
-        ttk.Button(btn_frame, text="📤 Export PDF", style="Accent.TButton", command=lambda: export_to_pdf(costs)).pack(side=tk.RIGHT, padx=10)
+        ttk.Button(btn_frame, text="🔄 New Calculation", command=lambda: [results_window.withdraw(), self.controller.start_quiz()]).pack(side=tk.LEFT, padx=10)
+        self.export_button = ttk.Button(btn_frame, text="📤 Export PDF", style="Accent.TButton", command=lambda: self.export_pdf(self.costs))
+        self.export_button.pack(side=tk.RIGHT, padx=10)
+        self.cancel_button = ttk.Button(btn_frame, text="✖ Cancel Export", command=self.cancel_export, state="disabled")
+        self.cancel_button.pack(side=tk.RIGHT, padx=10)
+
+        self.status_var = tk.StringVar()
+        ttk.Label(results_window, textvariable=self.status_var).pack(pady=(0, 10))
+
+    def export_pdf(self, costs):
+        if self.export_task is not None and not self.export_task.done():
+            return
+        from export_report import build_pdf, report_filename
+
+        filename = report_filename()
+        rate_card_totals = self.rate_card_totals
+        self.export_button.state(["disabled"])
+        self.cancel_button.state(["!disabled"])
+        self.status_var.set("Exporting PDF...")
+        self.export_task = self.controller.worker.submit(
+            lambda task: build_pdf(costs, filename, task, rate_card_totals),
+            on_done=self.export_finished, on_error=self.export_failed,
+            on_progress=self.export_progress, on_cancel=self.export_cancelled)
+
+    def cancel_export(self):
+        if self.export_task is not None:
+            self.export_task.cancel()
+            self.status_var.set("Cancelling export...")
+
+    def export_progress(self, fraction, message):
+        self.status_var.set(f"{message} ({fraction:.0%})")
+
+    def export_finished(self, filename):
+        self.reset_export_controls("")
+        messagebox.showinfo("Export Successful",
+                            f"Report saved as:\n{os.path.abspath(filename)}", parent=self.results_window)
+
+    def export_failed(self, error):
+        self.reset_export_controls("")
+        messagebox.showerror("Export Failed", f"Error generating PDF: {str(error)}", parent=self.results_window)
+
+    def export_cancelled(self):
+        self.reset_export_controls("Export cancelled")
+
+    def reset_export_controls(self, status):
+        self.export_task = None
+        self.status_var.set(status)
+        self.export_button.state(["!disabled"])
+        self.cancel_button.state(["disabled"])
 
-    def create_comparison_frame(self, parent, costs):
+    @timed("Results.create_comparison_frame")
+    def create_comparison_frame(self, parent):
         # Create container frame
         container = ttk.Frame(parent)
         container.pack(fill=tk.BOTH, expand=True)
 
         # Chart
-        fig = plt.Figure(figsize=(8, 4), dpi=100)
-        ax = fig.add_subplot(111)
-        services = ['ECS Fargate', 'Confluent Connector', 'EKS with EC2']
-        costs_total = [
-            costs['ECS']['total'],
-            costs['Confluent']['total'],
-            costs['EKS']['total']
-        ]
+        self.figure = Figure(figsize=(8, 4), dpi=100)
+        self.ax = self.figure.add_subplot(111)
         colors = ['#3498db', '#e67e22', '#2ecc71']
 
-        bars = ax.bar(services, costs_total, color=colors)
-        ax.set_title('Cost Summary', fontsize=14, pad=15)
-        ax.set_ylabel('Cost (USD)', fontsize=12)
+        self.bars = self.ax.bar(SERVICES, [0] * len(SERVICES), color=colors)
+        self.ax.set_title('Cost Summary', fontsize=14, pad=15)
+        self.ax.set_ylabel('Cost (USD)', fontsize=12)
 
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width() / 2., height,
-                    f'${height:.2f}', ha='center', va='bottom', fontsize=11)
+        self.bar_labels = [self.ax.text(bar.get_x() + bar.get_width() / 2., 0, '', ha='center', va='bottom', fontsize=11)
+                           for bar in self.bars]
 
         # Add legend
-        ax.legend(bars, services)
+        self.ax.legend(self.bars, SERVICES)
+
+        self.chart = FigureCanvasTkAgg(self.figure, container)
+        self.chart.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+
+    @timed("Results.update_comparison_frame")
+    def update_comparison_frame(self, costs):
+        for bar, label, key in zip(self.bars, self.bar_labels, SERVICE_KEYS):
+            height = costs[key]['total']
+            bar.set_height(height)
+            label.set_y(height)
+            label.set_text(f'${height:.2f}')
 
-        chart = FigureCanvasTkAgg(fig, container)
-        chart.get_tk_widget().pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.chart.draw_idle()
 
-    def create_breakdown_frame(self, parent, costs):
+    def create_breakdown_frame(self, parent):
         service_notebook = ttk.Notebook(parent)
         service_notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-        ecs_frame = ttk.Frame(service_notebook)
-        self.create_service_breakdown(ecs_frame, "ECS Fargate", costs['ECS'])
-        service_notebook.add(ecs_frame, text="ECS Fargate")
+        self.trees = {}
+        for service in SERVICES:
+            service_frame = ttk.Frame(service_notebook)
+            self.trees[service] = self.create_service_breakdown(service_frame)
+            service_notebook.add(service_frame, text=service)
+
+    def update_breakdown_frame(self, costs):
+        for service, key in zip(SERVICES, SERVICE_KEYS):
+            tree = self.trees[service]
+            items = service_breakdown_items(service, costs[key])
+            rows = tree.get_children()
+            if len(rows) != len(items):
+                tree.delete(*rows)
+                rows = [tree.insert("", tk.END) for _ in items]
+            for row, item in zip(rows, items):
+                tree.item(row, values=item)
+
+    def create_rate_card_frame(self, parent):
+        self.rate_card_tree = ttk.Treeview(parent, show="headings")
+        scrollbar = ttk.Scrollbar(parent, orient=tk.HORIZONTAL, command=self.rate_card_tree.xview)
+        self.rate_card_tree.configure(xscroll=scrollbar.set)
+        scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.rate_card_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.rate_card_rows = {}
+
+    @timed("Results.update_rate_card_frame")
+    def update_rate_card_frame(self, costs):
+        snapshot = self.controller.snapshot
+        rate_cards = snapshot.rate_cards if snapshot is not None else {}
+        if rate_cards is not self.rate_card_source:
+            # Only rebuilt when a workbook (re)load brings new rate cards
+            self.rate_card_source = rate_cards
+            self.rate_card_matrix = RateCardMatrix(rate_cards) if rate_cards else None
+            self.rebuild_rate_card_columns()
+        if self.rate_card_matrix is None:
+            self.rate_card_totals = None
+            return
 
-        confluent_frame = ttk.Frame(service_notebook)
-        self.create_service_breakdown(confluent_frame, "Confluent Connector", costs['Confluent'])
-        service_notebook.add(confluent_frame, text="Confluent Connector")
+        # Every card for every service in one (service x usage) @ (usage x card) product
+        self.rate_card_totals = compare_rate_cards(costs, self.rate_card_matrix)
+        for service, key in zip(SERVICES, SERVICE_KEYS):
+            totals = self.rate_card_totals[key]
+            self.rate_card_tree.item(self.rate_card_rows[key], values=[service] + [
+                f"${totals[card]:.2f}" for card in self.rate_card_matrix.names])
 
-        confluent_frame = ttk.Frame(service_notebook)
-        self.create_service_breakdown(confluent_frame, "EKS with EC2", costs['EKS'])
-        service_notebook.add(confluent_frame, text="EKS with EC2")
+    def rebuild_rate_card_columns(self):
+        tree = self.rate_card_tree
+        tree.delete(*tree.get_children())
+        names = self.rate_card_matrix.names if self.rate_card_matrix is not None else ()
+        columns = ["Service"] + [f"card{index}" for index in range(len(names))]
+        tree.configure(columns=columns)
+        tree.heading("Service", text="Service")
+        for column, name in zip(columns[1:], names):
+            tree.heading(column, text=name)
+            tree.column(column, anchor=tk.E, width=140, stretch=False)
+        self.rate_card_rows = {key: tree.insert("", tk.END) for key in SERVICE_KEYS}
 
-    def create_service_breakdown(self, parent, service, data):
+    def create_service_breakdown(self, parent):
         tree = ttk.Treeview(parent, columns=("Parameter", "Value"), show="headings")
         tree.heading("Parameter", text="Parameter")
         tree.heading("Value", text="Value")
 
-        if service == "ECS Fargate":
-            items = [
-                ("Number of Tasks", data['tasks']),
-                ("Task Duration per month (hours)", f"{data['tasks']} x {data['duration']}h"),
-                ("vCPUs per Task", data['vcpu']),
-                ("Memory per Task (GB)", data['memory']),
-                ("vCPU Cost", f"${data['vcpu_cost']:.2f}"),
-                ("Memory Cost", f"${data['memory_cost']:.2f}"),
-                ("Throughput (MBps)", f"{data['throughput']}MBps"),
-                ("Data Transfer Cost", f"${data['data_transfer_cost']:.2f}"),
-                ("Total Cost", f"${data['total']:.2f}")
-            ]
-        elif service == "Confluent Connector":
-            items = [
-                ("Number of Tasks", data['tasks']),
-                ("Task Duration per month (hours)", f"{data['tasks']} x {data['duration']}h"),
-                ("Connector Task Cost", f"${data['task_cost']:.2f}"),
-                ("Throughput (MBps)", f"{data['throughput']}MBps"),
-                ("Data Transfer Cost", f"${data['data_transfer_cost']:.2f}"),
-                ("Total Cost", f"${data['total']:.2f}")
-            ]
-        else:  # EKS
-            items = [
-                ("Cluster Cost (per month)", f"${data['eks_cluster_cost']:.2f}"),
-                ("Number of EC2 Nodes", data['nodes']),
-                ("Node Duration per month (hours)", f"{data['nodes']} x {data['duration']}h"),
-                ("Node Cost", f"${data['eks_node_cost']:.2f}"),
-                ("Throughput (MBps)", f"{data['throughput']}MBps"),
-                ("Data Transfer Cost", f"${data['data_transfer_cost']:.2f}"),
-                ("Total Cost", f"${data['total']:.2f}")
-            ]
-
-        for item in items:
-            tree.insert("", tk.END, values=item)
-
         scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=tree.yview)
         tree.configure(yscroll=scrollbar.set)
         tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
\ No newline at end of file
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        return tree
+
+
+def service_breakdown_items(service, data):
+    if service == "ECS Fargate":
+        return [
+            ("Number of Tasks", data['tasks']),
+            ("Task Duration per month (hours)", f"{data['tasks']} x {data['duration']}h"),
+            ("vCPUs per Task", data['vcpu']),
+            ("Memory per Task (GB)", data['memory']),
+            ("vCPU Cost", f"${data['vcpu_cost']:.2f}"),
+            ("Memory Cost", f"${data['memory_cost']:.2f}"),
+            ("Throughput (MBps)", f"{data['throughput']}MBps"),
+            ("Data Transfer Cost", f"${data['data_transfer_cost']:.2f}"),
+            ("Total Cost", f"${data['total']:.2f}")
+        ]
+    elif service == "Confluent Connector":
+        return [
+            ("Number of Tasks", data['tasks']),
+            ("Task Duration per month (hours)", f"{data['tasks']} x {data['duration']}h"),
+            ("Connector Task Cost", f"${data['task_cost']:.2f}"),
+            ("Throughput (MBps)", f"{data['throughput']}MBps"),
+            ("Data Transfer Cost", f"${data['data_transfer_cost']:.2f}"),
+            ("Total Cost", f"${data['total']:.2f}")
+        ]
+    else:  # EKS
+        return [
+            ("Cluster Cost (per month)", f"${data['eks_cluster_cost']:.2f}"),
+            ("Number of EC2 Nodes", data['nodes']),
+            ("Node Duration per month (hours)", f"{data['nodes']} x {data['duration']}h"),
+            ("Node Cost", f"${data['eks_node_cost']:.2f}"),
+            ("Throughput (MBps)", f"{data['throughput']}MBps"),
+            ("Data Transfer Cost", f"${data['data_transfer_cost']:.2f}"),
+            ("Total Cost", f"${data['total']:.2f}")
+        ]
@@ -0,0 +1,66 @@
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+COLUMNS = (("name", "Session", 200), ("saved_at", "Saved", 150), ("pricing", "Pricing", 150),
+           ("ecs", "ECS Fargate", 110), ("confluent", "Confluent Connector", 140), ("eks", "EKS with EC2", 110))
+
+
+class SessionBrowser(tk.Toplevel):
+
+    def __init__(self, root, controller):
+        super().__init__(root)
+        self.controller = controller
+        self.title("Saved Sessions")
+        self.geometry("900x420")
+
+        self.status_var = tk.StringVar()
+        ttk.Label(self, textvariable=self.status_var).pack(anchor=tk.W, padx=10)
+
+        self.tree = ttk.Treeview(self, columns=[key for key, _, _ in COLUMNS], show="headings")
+        for key, heading, width in COLUMNS:
+            self.tree.heading(key, text=heading)
+            self.tree.column(key, width=width, anchor=tk.W if key in ("name", "saved_at", "pricing") else tk.E)
+        self.tree.bind("<Double-1>", lambda event: self.open_selected())
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+
+        btn_frame = ttk.Frame(self)
+        btn_frame.pack(pady=10)
+        ttk.Button(btn_frame, text="Open", command=self.open_selected).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Delete", command=self.delete_selected).pack(side=tk.LEFT, padx=5)
+        ttk.Button(btn_frame, text="Re-price All...", command=self.controller.reprice_sessions).pack(side=tk.LEFT,
+                                                                                                   padx=5)
+        ttk.Button(btn_frame, text="Close", command=self.destroy).pack(side=tk.LEFT, padx=5)
+        self.refresh()
+
+    def refresh(self):
+        store = self.controller.session_store()
+        if store is None:
+            self.destroy()
+            return
+        current = self.controller.model.version
+        self.tree.delete(*self.tree.get_children())
+        for session in store.sessions():
+            saved_at = time.strftime("%Y-%m-%d %H:%M", time.localtime(session.saved_at))
+            pricing = "current" if session.model_version == current else f"older ({session.model_version[:8]})"
+            self.tree.insert("", tk.END, iid=session.name, values=(
+                session.name, saved_at, pricing, f"${session.totals['ECS']:.2f}",
+                f"${session.totals['Confluent']:.2f}", f"${session.totals['EKS']:.2f}"))
+        self.status_var.set(f"{len(store)} saved sessions in {store.path}")
+
+    def selected_name(self):
+        selection = self.tree.selection()
+        return selection[0] if selection else None
+
+    def open_selected(self):
+        name = self.selected_name()
+        if name is not None:
+            self.destroy()
+            self.controller.open_session(name)
+
+    def delete_selected(self):
+        name = self.selected_name()
+        if name is None or not messagebox.askyesno("Delete Session", f"Delete session '{name}'?", parent=self):
+            return
+        self.controller.session_store().delete(name)
+        self.refresh()
@@ -0,0 +1,273 @@
+import argparse
+import json
+import math
+import os
+import struct
+import time
+from array import array
+
+from questionnaire import CODE_TYPE, NUMBER_TYPE
+
+SESSIONS_PATH = os.environ.get("IDM_SESSIONS_PATH", "sessions.idms")
+MAGIC = b"IDMSESS1"
+# Every record is a header, the record name and a payload of the given length
+RECORD_HEADER = struct.Struct("<4sIH")
+# Pricing model version, questionnaire layout, saved at, ECS/Confluent/EKS totals when saved, vector lengths
+SESSION_HEADER = struct.Struct("<16s16sd3dII")
+LAYOUT_TAG = b"LAYT"
+SESSION_TAG = b"SESS"
+DELETE_TAG = b"DELE"
+
+
+class SavedSession:
+    __slots__ = ("name", "model_version", "layout", "saved_at", "totals", "codes", "numbers")
+
+    def __init__(self, name, model_version, layout, saved_at, totals, codes, numbers):
+        self.name = name
+        self.model_version = model_version
+        self.layout = layout
+        self.saved_at = saved_at
+        self.totals = totals
+        self.codes = codes
+        self.numbers = numbers
+
+
+class SessionStore:
+    # Sessions are appended as encoded questionnaire vectors. Saving a name again or deleting it appends
+    # another record and the index moves to it, so nothing already written is ever rewritten (until compact).
+    # Opening a store only walks the record headers to rebuild the name -> offset index.
+
+    def __init__(self, path=SESSIONS_PATH):
+        self.path = path
+        self.index = {}
+        self.layouts = {}
+        self.end = 0
+        self.scan()
+
+    def __len__(self):
+        return len(self.index)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def names(self):
+        return list(self.index)
+
+    def scan(self):
+        self.index = {}
+        self.layouts = {}
+        self.end = 0
+        if not os.path.exists(self.path):
+            return
+
+        size = os.path.getsize(self.path)
+        with open(self.path, "rb") as f:
+            magic = f.read(len(MAGIC))
+            if not magic:
+                return
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not a session file")
+            offset = len(MAGIC)
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    break
+                tag, length, name_length = RECORD_HEADER.unpack(header)
+                name = f.read(name_length)
+                if len(name) < name_length or f.tell() + length > size:
+                    break
+                name = name.decode()
+                if tag == LAYOUT_TAG:
+                    self.layouts[name] = parse_layout(f.read(length))
+                else:
+                    f.seek(length, os.SEEK_CUR)
+                    self.index.pop(name, None)
+                    if tag == SESSION_TAG:
+                        self.index[name] = offset
+                offset = f.tell()
+        # Anything past the last complete record is a torn write; the next append overwrites it
+        self.end = offset
+
+    def append(self, records):
+        mode = "r+b" if os.path.exists(self.path) else "w+b"
+        offsets = []
+        with open(self.path, mode) as f:
+            if self.end == 0:
+                f.truncate(0)
+                f.write(MAGIC)
+                self.end = len(MAGIC)
+            f.seek(self.end)
+            f.truncate()
+            for tag, name, payload in records:
+                encoded = name.encode()
+                if not encoded or len(encoded) > 0xFFFF:
+                    raise ValueError("session names must be 1 to 65535 bytes long")
+                offsets.append(f.tell())
+                f.write(RECORD_HEADER.pack(tag, len(payload), len(encoded)) + encoded + payload)
+            f.flush()
+            os.fsync(f.fileno())
+            self.end = f.tell()
+        return offsets
+
+    def save(self, name, responses, questionnaire, saved_at=None):
+        codes, numbers = questionnaire.encode(responses)
+        costs = questionnaire.costs(codes, numbers)
+        session = SavedSession(name, questionnaire.model_version, questionnaire.layout,
+                               time.time() if saved_at is None else saved_at,
+                               {key: costs[key]['total'] for key in ('ECS', 'Confluent', 'EKS')}, codes, numbers)
+        layout = (questionnaire.choice_questions, questionnaire.numeric_questions, tuple(questionnaire.answer_ids))
+        records = []
+        if questionnaire.layout not in self.layouts:
+            records.append((LAYOUT_TAG, questionnaire.layout, json.dumps(layout).encode()))
+        records.append((SESSION_TAG, name, session_payload(session)))
+
+        offsets = self.append(records)
+        self.layouts[questionnaire.layout] = layout
+        self.index.pop(name, None)
+        self.index[name] = offsets[-1]
+
+    def delete(self, name):
+        if name not in self.index:
+            raise KeyError(name)
+        self.append([(DELETE_TAG, name, b"")])
+        del self.index[name]
+
+    def read(self, name):
+        with open(self.path, "rb") as f:
+            return self.read_at(f, self.index[name])
+
+    def read_at(self, f, offset):
+        f.seek(offset)
+        _, length, name_length = RECORD_HEADER.unpack(f.read(RECORD_HEADER.size))
+        name = f.read(name_length).decode()
+        payload = f.read(length)
+
+        model_version, layout, saved_at, ecs, confluent, eks, code_count, number_count = \
+            SESSION_HEADER.unpack_from(payload)
+        codes = array(CODE_TYPE)
+        numbers = array(NUMBER_TYPE)
+        start = SESSION_HEADER.size
+        codes.frombytes(payload[start:start + code_count * codes.itemsize])
+        start += code_count * codes.itemsize
+        numbers.frombytes(payload[start:start + number_count * numbers.itemsize])
+        return SavedSession(name, model_version.decode(), layout.decode(), saved_at,
+                            {'ECS': ecs, 'Confluent': confluent, 'EKS': eks}, codes, numbers)
+
+    def sessions(self):
+        # One sequential pass over the file, in file order
+        if not self.index:
+            return
+        with open(self.path, "rb") as f:
+            for offset in sorted(self.index.values()):
+                yield self.read_at(f, offset)
+
+    def responses(self, session, questionnaire):
+        if session.layout == questionnaire.layout:
+            return questionnaire.decode(session.codes, session.numbers)
+        # Saved against an older questionnaire: go back to question/answer IDs through the layout it used
+        choice_questions, numeric_questions, answer_ids = self.layouts[session.layout]
+        responses = {}
+        for q_id, code, ids in zip(choice_questions, session.codes, answer_ids):
+            if code:
+                responses[q_id] = ids[code - 1]
+        for q_id, value in zip(numeric_questions, session.numbers):
+            if not math.isnan(value):
+                responses[q_id] = value
+        return responses
+
+    def vectors(self, session, questionnaire):
+        if session.layout == questionnaire.layout:
+            return session.codes, session.numbers
+        return questionnaire.encode(self.responses(session, questionnaire), strict=False)
+
+    def compact(self):
+        # Rewrites only the live sessions (and the layouts they use) and swaps the file in atomically
+        sessions = list(self.sessions())
+        temp_path = f"{self.path}.tmp"
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        records = [(LAYOUT_TAG, layout, json.dumps(self.layouts[layout]).encode())
+                   for layout in dict.fromkeys(session.layout for session in sessions)]
+        records += [(SESSION_TAG, session.name, session_payload(session)) for session in sessions]
+        SessionStore(temp_path).append(records)
+        os.replace(temp_path, self.path)
+        self.scan()
+
+
+def session_payload(session):
+    header = SESSION_HEADER.pack(session.model_version.encode(), session.layout.encode(), session.saved_at,
+                                 session.totals['ECS'], session.totals['Confluent'], session.totals['EKS'],
+                                 len(session.codes), len(session.numbers))
+    return header + session.codes.tobytes() + session.numbers.tobytes()
+
+
+def parse_layout(payload):
+    choice_questions, numeric_questions, answer_ids = json.loads(payload)
+    return tuple(choice_questions), tuple(numeric_questions), tuple(tuple(ids) for ids in answer_ids)
+
+
+def reprice_sessions(store, questionnaire):
+    # Every saved session priced against the current workbook in one quote_codes call
+    import numpy as np
+    import pandas as pd
+
+    from batch import quote_codes
+    from cost_engine import RESULT_COLUMNS
+    from sweep import SERVICES, TOTAL_COLUMNS
+
+    sessions = list(store.sessions())
+    codes = np.zeros((len(sessions), len(questionnaire.choice_questions)), dtype=np.int32)
+    numbers = np.full((len(sessions), len(questionnaire.numeric_questions)), np.nan)
+    for row, session in enumerate(sessions):
+        codes[row], numbers[row] = store.vectors(session, questionnaire)
+    arrays = quote_codes(questionnaire, codes, numbers)
+
+    summary = pd.DataFrame({
+        'name': [session.name for session in sessions],
+        'saved_at': pd.to_datetime([session.saved_at for session in sessions], unit='s'),
+        'saved_model_version': [session.model_version for session in sessions],
+        'model_version': questionnaire.model_version,
+    })
+    summary['repriced'] = summary['saved_model_version'] != questionnaire.model_version
+    for column in RESULT_COLUMNS:
+        summary[column] = arrays[column]
+    for key, column in zip(('ECS', 'Confluent', 'EKS'), TOTAL_COLUMNS):
+        summary[f"saved_{column}"] = [session.totals[key] for session in sessions]
+        summary[f"{column}_change"] = summary[column] - summary[f"saved_{column}"]
+    totals = np.column_stack([arrays[column] for column in TOTAL_COLUMNS])
+    summary['cheapest'] = pd.Categorical.from_codes(totals.argmin(axis=1), categories=SERVICES)
+    return summary
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="List or re-price saved calculator sessions.")
+    parser.add_argument("--sessions", default=SESSIONS_PATH, help="session file to read")
+    parser.add_argument("--workbook", help="pricing workbook to re-price against")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="list saved sessions")
+    reprice = subparsers.add_parser("reprice", help="re-price every saved session against current pricing")
+    reprice.add_argument("-o", "--output", default="-", help="summary CSV file, or - for stdout (default)")
+    subparsers.add_parser("compact", help="drop overwritten and deleted sessions from the file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    import sys
+
+    from workbook import WORKBOOK_PATH, load_snapshot
+
+    args = parse_args(argv)
+    store = SessionStore(args.sessions)
+    if args.command == "list":
+        for session in store.sessions():
+            saved_at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(session.saved_at))
+            print(f"{session.name}\t{saved_at}\t{session.model_version}")
+    elif args.command == "compact":
+        store.compact()
+    else:
+        summary = reprice_sessions(store, load_snapshot(args.workbook or WORKBOOK_PATH).questionnaire)
+        summary.to_csv(sys.stdout if args.output == "-" else args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from batch import LogicTables, quote_arrays
+from cost_engine import RESULT_COLUMNS
+
+SERVICES = ('ECS Fargate', 'Confluent Connector', 'EKS with EC2')
+TOTAL_COLUMNS = ('ecs_total', 'confluent_total', 'eks_total')
+
+DEFAULT_THROUGHPUTS = np.arange(1, 1001, dtype=np.float64)
+DEFAULT_DURATIONS = np.arange(1, 745, dtype=np.float64)
+DEFAULT_CHUNK_SIZE = 250_000
+
+
+def answer_combinations(tables):
+    return list(itertools.product(*(answer_ids.tolist() for answer_ids in tables.answer_ids)))
+
+
+def sweep(model, throughputs=DEFAULT_THROUGHPUTS, durations=DEFAULT_DURATIONS, combinations=None,
+          chunk_size=DEFAULT_CHUNK_SIZE, tables=None):
+    # Grid order is combination -> duration -> throughput (fastest); each chunk is indexed by flat grid position
+    if tables is None:
+        tables = LogicTables(model)
+    if combinations is None:
+        combinations = answer_combinations(tables)
+
+    throughputs = np.asarray(throughputs, dtype=np.float64)
+    durations = np.asarray(durations, dtype=np.float64)
+    combo_matrix = np.asarray(combinations, dtype=np.float64).reshape(len(combinations), len(tables.question_ids))
+    shape = (len(combo_matrix), len(durations), len(throughputs))
+    total = int(np.prod(shape))
+
+    for start in range(0, total, chunk_size):
+        points = np.arange(start, min(start + chunk_size, total))
+        combo_idx, duration_idx, throughput_idx = np.unravel_index(points, shape)
+        answers = [combo_matrix[combo_idx, column] for column in range(combo_matrix.shape[1])]
+        arrays = quote_arrays(tables, answers, throughputs[throughput_idx], durations[duration_idx],
+                              model.pricing)
+
+        frame = pd.DataFrame({q_id: answer for q_id, answer in zip(tables.question_ids, answers)}, index=points)
+        for column in RESULT_COLUMNS:
+            frame[column] = arrays[column]
+        totals = np.column_stack([arrays[column] for column in TOTAL_COLUMNS])
+        frame['cheapest'] = pd.Categorical.from_codes(totals.argmin(axis=1), categories=SERVICES)
+        yield frame
+
+
+def crossovers(chunks, points_per_line):
+    # Walks the throughput axis of each (combination, duration) line and reports where the cheapest service
+    # changes. Every cost term scales with duration, so the ranking never flips along that axis.
+    previous = None
+    for chunk in chunks:
+        frame = chunk if previous is None else pd.concat([previous, chunk])
+        points = frame.index.to_numpy()
+        codes = frame['cheapest'].cat.codes.to_numpy()
+
+        same_line = points[1:] // points_per_line == points[:-1] // points_per_line
+        changed = np.flatnonzero(same_line & (codes[1:] != codes[:-1]))
+        if len(changed):
+            before = frame.iloc[changed]
+            after = frame.iloc[changed + 1]
+            totals = frame[list(TOTAL_COLUMNS)].to_numpy()
+            from_codes = codes[changed]
+            to_codes = codes[changed + 1]
+
+            # Totals are linear in throughput, so the exact crossing is a straight-line interpolation
+            gap_before = totals[changed, from_codes] - totals[changed, to_codes]
+            gap_after = totals[changed + 1, from_codes] - totals[changed + 1, to_codes]
+            t0 = before['throughput'].to_numpy()
+            t1 = after['throughput'].to_numpy()
+            span = gap_before - gap_after
+            fraction = np.clip(np.divide(gap_before, span, out=np.ones_like(span), where=span != 0), 0.0, 1.0)
+
+            result = after.drop(columns=['cheapest'] + list(RESULT_COLUMNS)).copy()
+            result['duration'] = after['duration'].to_numpy()
+            result['throughput_before'] = t0
+            result['throughput_after'] = t1
+            result['crossover_throughput'] = t0 + (t1 - t0) * fraction
+            result['from_service'] = np.asarray(SERVICES)[from_codes]
+            result['to_service'] = np.asarray(SERVICES)[to_codes]
+            result['crossover_cost'] = totals[changed, from_codes] + (
+                totals[changed + 1, from_codes] - totals[changed, from_codes]) * fraction
+            yield result
+        previous = frame.iloc[-1:]
+
+
+def sweep_crossovers(model, throughputs=DEFAULT_THROUGHPUTS, durations=DEFAULT_DURATIONS, combinations=None,
+                     chunk_size=DEFAULT_CHUNK_SIZE):
+    chunks = sweep(model, throughputs, durations, combinations, chunk_size)
+    found = list(crossovers(chunks, len(throughputs)))
+    if not found:
+        return pd.DataFrame()
+    return pd.concat(found)
@@ -0,0 +1,263 @@
+import hashlib
+import math
+import os
+import pickle
+
+from cost_engine import DURATION_QUESTION, PRICING_PARAMETERS, THROUGHPUT_QUESTION, CostModel, LogicRecord
+from questionnaire import CompiledQuestionnaire
+
+WORKBOOK_PATH = "assets/cloud_costs.xlsx"
+SHEETS = ("Questions", "Answers", "Logic", "Pricing")
+# Extra rate cards live in sheets named e.g. "Pricing - EU" laid out like the Pricing sheet
+RATE_CARD_SHEET_PREFIX = "Pricing"
+DEFAULT_RATE_CARD_COLUMN = 'Value (USD)'
+CACHE_FORMAT = 3
+
+
+def cache_path_for(path):
+    folder, name = os.path.split(path)
+    return os.path.join(folder, f".{name}.cache")
+
+
+def file_digest(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_workbook(path=WORKBOOK_PATH):
+    # pandas is only needed when the cache has to be rebuilt, so it is not imported at startup
+    import pandas as pd
+
+    # Open the workbook once and parse every sheet from the same handle
+    with pd.ExcelFile(path) as xls:
+        names = list(SHEETS) + [name for name in xls.sheet_names
+                                if name.startswith(RATE_CARD_SHEET_PREFIX) and name not in SHEETS]
+        return {name: xls.parse(name) for name in names}
+
+
+def sheet_columns(sheet):
+    return {column: sheet[column].tolist() for column in sheet.columns}
+
+
+def read_cache(cache_path):
+    try:
+        with open(cache_path, "rb") as f:
+            cache = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    if not isinstance(cache, dict) or cache.get("format") != CACHE_FORMAT:
+        return None
+    return cache
+
+
+def write_cache(cache_path, cache):
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # A read-only install still works, it just rebuilds on every launch
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def load_tables(path=WORKBOOK_PATH, use_cache=True):
+    # Sheets as plain {column: list} dicts; a warm cache is loaded without importing pandas
+    if not use_cache:
+        return {name: sheet_columns(sheet) for name, sheet in read_workbook(path).items()}
+
+    stat = os.stat(path)
+    cache_path = cache_path_for(path)
+    cache = read_cache(cache_path)
+
+    if cache and cache["mtime_ns"] == stat.st_mtime_ns and cache["size"] == stat.st_size:
+        return cache["sheets"]
+
+    # mtime changed (or no cache): only rebuild if the content really differs
+    digest = file_digest(path)
+    if cache and cache["sha1"] == digest:
+        sheets = cache["sheets"]
+    else:
+        sheets = {name: sheet_columns(sheet) for name, sheet in read_workbook(path).items()}
+
+    write_cache(cache_path, {
+        "format": CACHE_FORMAT,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha1": digest,
+        "sheets": sheets,
+    })
+    return sheets
+
+
+def load_workbook(path=WORKBOOK_PATH, use_cache=True):
+    import pandas as pd
+
+    return {name: pd.DataFrame(columns) for name, columns in load_tables(path, use_cache).items()}
+
+
+LOGIC_COLUMNS = ('ECS Tasks', 'ECS vCPU', 'ECS Memory (GB)', 'Connector Tasks', 'EKS Nodes',
+                 'Data Transfer Multiplier')
+
+
+def build_logic_index(logic):
+    index = {}
+    keys = zip(list(logic['Question ID']), list(logic['Answer ID']))
+    values = zip(*(list(logic[column]) for column in LOGIC_COLUMNS))
+    for key, row in zip(keys, values):
+        # The first matching row wins, as with the old boolean-mask lookup
+        if key not in index:
+            index[key] = LogicRecord(*row)
+    return index
+
+
+def build_answer_index(answers):
+    index = {}
+    for q_id, a_id, text in zip(answers['Question ID'], answers['Answer ID'], answers['Answer Text']):
+        index.setdefault(q_id, []).append((a_id, text))
+    return {q_id: tuple(options) for q_id, options in index.items()}
+
+
+def build_question_list(questions):
+    return tuple(zip(questions['Question ID'], questions['Question Text'], questions['Input Type']))
+
+
+def rate_card_columns(tables):
+    # The Pricing sheet's value column, plus any other numeric column of it, is a rate card named after its
+    # header. So is each numeric column of an extra "Pricing ..." sheet, named after the sheet when it uses
+    # the default header. Text columns such as units or notes are left alone.
+    columns = []
+    for sheet_name, sheet in tables.items():
+        if not sheet_name.startswith(RATE_CARD_SHEET_PREFIX):
+            continue
+        suffix = sheet_name[len(RATE_CARD_SHEET_PREFIX):].strip(" -_:")
+        for column in sheet:
+            values = [value for value in sheet[column] if not is_blank(value)]
+            numeric = values and all(is_number(value) for value in values)
+            if column == 'Parameter' or (column != DEFAULT_RATE_CARD_COLUMN and not numeric):
+                continue
+            if sheet_name == "Pricing":
+                name = column
+            elif column == DEFAULT_RATE_CARD_COLUMN:
+                name = suffix
+            else:
+                name = f"{suffix} {column}"
+            columns.append((sheet_name, column, name))
+    return columns
+
+
+def build_rate_cards(tables):
+    return {name: dict(zip(tables[sheet_name]['Parameter'], tables[sheet_name][column]))
+            for sheet_name, column, name in rate_card_columns(tables)}
+
+
+def build_cost_model(sheets):
+    pricing = dict(zip(sheets["Pricing"]['Parameter'], sheets["Pricing"]['Value (USD)']))
+    return CostModel(build_logic_index(sheets["Logic"]), pricing, list(sheets["Questions"]['Question ID']))
+
+
+REQUIRED_COLUMNS = {
+    "Questions": ('Question ID', 'Question Text', 'Input Type'),
+    "Answers": ('Question ID', 'Answer ID', 'Answer Text'),
+    "Logic": ('Question ID', 'Answer ID') + LOGIC_COLUMNS,
+    "Pricing": ('Parameter', 'Value (USD)'),
+}
+INPUT_TYPES = ('Multiple Choice', 'Numeric')
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def is_blank(value):
+    return value is None or value == "" or (isinstance(value, float) and math.isnan(value))
+
+
+def validate_tables(tables):
+    problems = []
+    for sheet, columns in REQUIRED_COLUMNS.items():
+        if sheet not in tables:
+            problems.append(f"missing sheet '{sheet}'")
+            continue
+        missing = [column for column in columns if column not in tables[sheet]]
+        if missing:
+            problems.append(f"sheet '{sheet}' is missing columns: {', '.join(missing)}")
+    if problems:
+        raise ValueError("; ".join(problems))
+
+    questions = tables["Questions"]
+    if not questions['Question ID']:
+        problems.append("no questions defined")
+    input_types = dict(zip(questions['Question ID'], questions['Input Type']))
+    for q_id, input_type in input_types.items():
+        if input_type not in INPUT_TYPES:
+            problems.append(f"question {q_id} has unknown input type '{input_type}'")
+    for q_id in (THROUGHPUT_QUESTION, DURATION_QUESTION):
+        if input_types.get(q_id) != 'Numeric':
+            problems.append(f"question {q_id} must exist and be Numeric")
+
+    answered = set(tables["Answers"]['Question ID'])
+    for q_id, input_type in input_types.items():
+        if input_type == 'Multiple Choice' and q_id not in answered:
+            problems.append(f"question {q_id} has no answers")
+
+    logic = tables["Logic"]
+    for column in LOGIC_COLUMNS:
+        if not all(is_number(value) for value in logic[column]):
+            problems.append(f"Logic column '{column}' has non-numeric values")
+
+    for sheet_name, sheet in tables.items():
+        if sheet_name.startswith(RATE_CARD_SHEET_PREFIX) and 'Parameter' not in sheet:
+            problems.append(f"sheet '{sheet_name}' is missing columns: Parameter")
+    if problems:
+        raise ValueError("; ".join(problems))
+
+    sources = {}
+    for sheet_name, column, name in rate_card_columns(tables):
+        if name in sources:
+            problems.append(f"rate card '{name}' is defined by both {sources[name]} and "
+                            f"column '{column}' of sheet '{sheet_name}'")
+        sources[name] = f"column '{column}' of sheet '{sheet_name}'"
+    if problems:
+        raise ValueError("; ".join(problems))
+
+    for card, pricing in build_rate_cards(tables).items():
+        for name in PRICING_PARAMETERS:
+            if name not in pricing:
+                problems.append(f"rate card '{card}' is missing '{name}'")
+            elif not is_number(pricing[name]) or pricing[name] < 0:
+                problems.append(f"rate card '{card}' price '{name}' must be a non-negative number")
+
+    if problems:
+        raise ValueError("; ".join(problems))
+
+
+class WorkbookSnapshot:
+    # Everything the app and services derive from one version of the workbook; never mutated after loading,
+    # so a reload swaps the whole snapshot and readers holding the old one are unaffected
+    __slots__ = ("questions", "answer_index", "model", "rate_cards", "questionnaire", "stamp")
+
+    def __init__(self, questions, answer_index, model, rate_cards, stamp):
+        self.questions = questions
+        self.answer_index = answer_index
+        self.model = model
+        self.rate_cards = rate_cards
+        self.questionnaire = CompiledQuestionnaire(questions, answer_index, model)
+        self.stamp = stamp
+
+
+def file_stamp(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_snapshot(path=WORKBOOK_PATH):
+    stamp = file_stamp(path)
+    tables = load_tables(path)
+    validate_tables(tables)
+    return WorkbookSnapshot(build_question_list(tables["Questions"]), build_answer_index(tables["Answers"]),
+                            build_cost_model(tables), build_rate_cards(tables), stamp)
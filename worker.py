@@ -0,0 +1,104 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+POLL_INTERVAL_MS = 50
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class Task:
+    def __init__(self, worker, on_done, on_error, on_progress, on_cancel):
+        self.worker = worker
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.cancel_event = threading.Event()
+        self.future = None
+
+    # Called from the worker thread; the callbacks themselves always run on the Tk thread
+    def progress(self, fraction, message=""):
+        self.check_cancelled()
+        self.worker.events.put((self, "progress", (fraction, message)))
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise TaskCancelled()
+
+    def cancel(self):
+        if self.cancel_event.is_set():
+            return
+        self.cancel_event.set()
+        if self.future is not None and self.future.cancel():
+            self.worker.events.put((self, "cancelled", None))
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+
+class BackgroundWorker:
+    # Runs calculations and exports off the Tk thread and reports back through root.after polling
+
+    def __init__(self, root, max_workers=1, poll_interval_ms=POLL_INTERVAL_MS):
+        self.root = root
+        self.poll_interval_ms = poll_interval_ms
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="idm-worker")
+        self.events = queue.Queue()
+        self.pending = 0
+        self.poll_job = None
+
+    def submit(self, fn, *args, on_done=None, on_error=None, on_progress=None, on_cancel=None):
+        task = Task(self, on_done, on_error, on_progress, on_cancel)
+        task.future = self.executor.submit(self._run, task, fn, args)
+        self.pending += 1
+        if self.poll_job is None:
+            self.poll_job = self.root.after(self.poll_interval_ms, self._poll)
+        return task
+
+    def _run(self, task, fn, args):
+        try:
+            task.check_cancelled()
+            result = fn(task, *args)
+            task.check_cancelled()
+        except TaskCancelled:
+            self.events.put((task, "cancelled", None))
+        except Exception as e:
+            self.events.put((task, "error", e))
+        else:
+            self.events.put((task, "done", result))
+
+    def _poll(self):
+        self.poll_job = None
+        while True:
+            try:
+                task, kind, payload = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                if task.on_progress is not None and not task.cancelled:
+                    task.on_progress(*payload)
+                continue
+
+            self.pending -= 1
+            if kind == "done" and task.on_done is not None:
+                task.on_done(payload)
+            elif kind == "error" and task.on_error is not None:
+                task.on_error(payload)
+            elif kind == "cancelled" and task.on_cancel is not None:
+                task.on_cancel()
+
+        if self.pending > 0:
+            self.poll_job = self.root.after(self.poll_interval_ms, self._poll)
+
+    def shutdown(self):
+        if self.poll_job is not None:
+            self.root.after_cancel(self.poll_job)
+            self.poll_job = None
+        self.executor.shutdown(wait=False, cancel_futures=True)